@@ -21,21 +21,31 @@ Usage :
 """
 
 import argparse
+import asyncio
+import functools
 import pathlib
+import re
 import sys
 from datetime import timedelta
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List
 
-from youtubesearchpython import VideosSearch, PlaylistsSearch
+from youtubesearchpython.__future__ import VideosSearch, PlaylistsSearch
+
+from disk_cache import disk_memoize
 
 
 # ------------------------------------------------------------
 # Utils
 # ------------------------------------------------------------
 EXCLUDE_FOR_FULL = ("live", "cover", "reaction", "react", "tribute", "rehearsal")
+# Une seule passe sur le titre, mots entiers, casse ignorée
+EXCLUDE_RE = re.compile(r"\b(" + "|".join(EXCLUDE_FOR_FULL) + r")\b", re.I)
 DURATION_THRESHOLD_MINUTES = (
     25  # en-dessous on suppose que ce n’est pas un album complet
 )
+MAX_CONCURRENT_SEARCHES = 10  # évite de se faire bloquer par YouTube
+CACHE_DB = pathlib.Path.home() / ".cache" / "yt_dl" / "search.sqlite"
+CACHE_TTL = 7 * 86400  # 7 jours
 
 
 def parse_args() -> argparse.Namespace:
@@ -54,6 +64,17 @@ def parse_args() -> argparse.Namespace:
         default="full",
         help="Type de recherche (défaut : full)",
     )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Relancer les recherches sans lire le cache",
+    )
+    ap.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=CACHE_TTL,
+        help="Validité du cache en secondes (défaut : 7 jours)",
+    )
     ap.add_argument(
         "--out",
         type=pathlib.Path,
@@ -63,111 +84,132 @@ def parse_args() -> argparse.Namespace:
     return ap.parse_args()
 
 
+@functools.lru_cache(maxsize=4096)
 def clean_duration(s: str) -> int:
     """
-    '1:05:33' -> 3933 secondes
-    '38:17'   -> 2297 secondes
-    ''        -> 0
+    '1:05:33'   -> 3933 secondes
+    '38:17'     -> 2297 secondes
+    ''          -> 0
+    '12 vidéos' -> 0 (playlist : durée inconnue)
     """
     if not s:
         return 0
-    parts = list(map(int, s.split(":")))
-    if len(parts) == 3:
-        h, m, s_ = parts
-    elif len(parts) == 2:
-        h, m, s_ = 0, *parts
-    else:
+    total = 0
+    try:
+        for part in s.split(":"):
+            total = total * 60 + int(part)
+    except ValueError:
         return 0
-    return h * 3600 + m * 60 + s_
-
-
-def is_result_valid(
-    result: Dict, search_type: str, original_query: str
-) -> Tuple[bool, str]:
-    """Filtrer selon le type et la durée minimale."""
-    title = result["title"].lower()
-    duration_sec = clean_duration(result.get("duration", ""))
-    # full album : bannir certains mots
-    if search_type == "full" and any(k in title for k in EXCLUDE_FOR_FULL):
-        return False, "Mot-clé exclu"
-    # live / cover / react : doit contenir le mot-clé correspondant
-    if search_type != "full" and search_type not in title:
-        return False, f"'{search_type}' absent"
-    if duration_sec and duration_sec < DURATION_THRESHOLD_MINUTES * 60:
-        return False, "Durée trop courte"
-    return True, ""
-
-
-def search_one_album(query: str, search_type: str) -> List[Dict]:
+    return total
+
+
+def filter_valid(entries: Iterable[Dict], search_type: str, limit: int) -> List[Dict]:
+    """
+    Filtre selon le type et la durée minimale, en un seul passage ; on
+    s'arrête dès 'limit' résultats retenus.
+    """
+    min_sec = DURATION_THRESHOLD_MINUTES * 60
+    full = search_type == "full"
+
+    kept = []
+    for e in entries:
+        title = e["title"]
+        if full:
+            # full album : bannir certains mots
+            if EXCLUDE_RE.search(title):
+                continue
+        # live / cover / react : doit contenir le mot-clé correspondant
+        elif search_type not in title.lower():
+            continue
+        dur = clean_duration(e["duration"])
+        if dur and dur < min_sec:
+            continue
+        kept.append(e)
+        if len(kept) >= limit:
+            break
+    return kept
+
+
+@disk_memoize(
+    CACHE_DB, CACHE_TTL, key=lambda query, search_type, *_: f"{query}|{search_type}"
+)
+async def search_one_album(
+    query: str, search_type: str, sem: asyncio.Semaphore
+) -> List[Dict]:
     """
     Retourne les 3 meilleurs résultats pertinents (playlist ou vidéo).
     Stratégie :
         1. Rechercher des playlists qui contiennent le nom de l'album
         2. Compléter avec des vidéos si besoin
+    Les deux recherches sont lancées en parallèle.
     """
-    wanted = []
+    async with sem:
+        playlist_search = PlaylistsSearch(f"{query} {search_type} album", limit=10)
+        videos_search = VideosSearch(f"{query} {search_type} album", limit=20)
+        playlists, videos = await asyncio.gather(
+            playlist_search.next(), videos_search.next()
+        )
 
     # 1) Playlists
-    playlist_search = PlaylistsSearch(f"{query} {search_type} album", limit=10)
-    for p in playlist_search.result()["result"]:
-        entry = {
-            "link": p["link"],
-            "title": p["title"],
-            "duration": f'{p["videoCount"]} vidéos',
-            "type": "playlist",
-        }
-        ok, _ = is_result_valid(entry, search_type, query)
-        if ok:
-            wanted.append(entry)
-        if len(wanted) >= 3:
-            break
+    wanted = filter_valid(
+        (
+            {
+                "link": p["link"],
+                "title": p["title"],
+                "duration": f'{p["videoCount"]} vidéos',
+                "type": "playlist",
+            }
+            for p in playlists["result"]
+        ),
+        search_type,
+        3,
+    )
 
     # 2) Vidéos
     if len(wanted) < 3:
-        videos_search = VideosSearch(f"{query} {search_type} album", limit=20)
-        for v in videos_search.result()["result"]:
-            entry = {
-                "link": v["link"],
-                "title": v["title"],
-                "duration": v.get("duration", ""),
-                "type": "video",
-            }
-            ok, _ = is_result_valid(entry, search_type, query)
-            if ok:
-                wanted.append(entry)
-            if len(wanted) >= 3:
-                break
-
-    return wanted[:3]
-
-
-def process_queries(queries: List[str], search_type: str) -> Dict[str, List[Dict]]:
-    all_results = {}
-    for q in queries:
-        q_clean = q.strip()
-        if not q_clean:
-            continue
-        results = search_one_album(q_clean, search_type)
-        all_results[q_clean] = results
-    return all_results
+        wanted += filter_valid(
+            (
+                {
+                    "link": v["link"],
+                    "title": v["title"],
+                    "duration": v.get("duration", ""),
+                    "type": "video",
+                }
+                for v in videos["result"]
+            ),
+            search_type,
+            3 - len(wanted),
+        )
+
+    return wanted
+
+
+async def process_queries(
+    queries: List[str], search_type: str
+) -> Dict[str, List[Dict]]:
+    sem = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+    # Albums en double dans le fichier : une seule recherche (ordre conservé)
+    cleaned = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+    results = await asyncio.gather(
+        *(search_one_album(q, search_type, sem) for q in cleaned)
+    )
+    return dict(zip(cleaned, results))
 
 
 def display_and_save(all_results: Dict[str, List[Dict]], outfile: pathlib.Path) -> None:
-    """Affiche sur stdout et écrit un fichier plat."""
-    with outfile.open("w", encoding="utf-8") as fh:
+    """Affiche sur stdout et écrit un fichier plat (une écriture par album)."""
+    with outfile.open("w", encoding="utf-8", buffering=1 << 16) as fh:
         for album, items in all_results.items():
-            header = f"\n=== {album} ==="
-            print(header)
-            fh.write(header + "\n")
+            buf = [f"\n=== {album} ===\n"]
             if not items:
-                msg = "  Aucun résultat pertinent trouvé."
-                print(msg)
-                fh.write(msg + "\n")
-                continue
+                buf.append("  Aucun résultat pertinent trouvé.\n")
             for idx, it in enumerate(items, 1):
-                line = f"  {idx}. {it['link']} | {it['title']} | {it['duration']}"
-                print(line)
-                fh.write(line + "\n")
+                buf.append(
+                    f"  {idx}. {it['link']} | {it['title']} | {it['duration']}\n"
+                )
+            chunk = "".join(buf)
+            sys.stdout.write(chunk)
+            fh.write(chunk)
 
 
 # ------------------------------------------------------------
@@ -184,7 +226,9 @@ def main() -> None:
             sys.exit(f"Fichier {args.file} introuvable.")
         queries = args.file.read_text(encoding="utf-8").splitlines()
 
-    results = process_queries(queries, args.type)
+    search_one_album.enabled = not args.no_cache
+    search_one_album.ttl = args.cache_ttl
+    results = asyncio.run(process_queries(queries, args.type))
     display_and_save(results, args.out)
     print(f"\nRésultats écrits dans {args.out.resolve()}")
 
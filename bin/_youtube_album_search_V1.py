@@ -1,157 +1,283 @@
 import argparse
-import re
+import hashlib
+import io
+import json
 import os
-from typing import List, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
 from yt_dlp import YoutubeDL
 from datetime import timedelta
 
+try:  # moteur optionnel, compatible avec re
+    import regex as re  # type: ignore
+except ImportError:
+    import re
+
 # --- Configuration ---
 DEFAULT_MAX_RESULTS = 20
 DEFAULT_TOP_RESULTS = 5
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+CACHE_DIR = os.path.expanduser("~/.cache/yt_album_search")
+CACHE_TTL = 86400  # 24 h
+TITLE_SCAN_MAX = 300  # borne la longueur de titre analysée par les filtres
+CACHE_VERSION = 2  # à incrémenter si le format des résultats change
+# Mots-clés classés du plus fréquent au plus rare dans les résultats YouTube :
+# l'alternance regex est testée de gauche à droite.
 BLACKLIST_KEYWORDS = {
     "full": [
         "live",
         "cover",
+        "remix",
         "reaction",
         "react",
         "tribute",
-        "interview",
         "trailer",
         "teaser",
-        "remix",
+        "interview",
     ],
     "live": ["cover", "reaction", "react", "tribute"],
     "cover": ["reaction", "react"],
     "react": [],
 }
+# Une seule regex d'alternance par mode (+ "single", exclu partout) :
+# un seul passage sur le titre
+_BLACKLIST_RE = {
+    mode: re.compile("|".join(map(re.escape, [*kws, "single"])))
+    for mode, kws in BLACKLIST_KEYWORDS.items()
+}
+
 
 # --- Argparse avec --help enrichi ---
-parser = argparse.ArgumentParser(
-    description="Recherche des albums sur YouTube (vidéos ou playlists) avec ou sans clé API.\n\n"
-    "🔧 Dépendances requises :\n"
-    " - yt-dlp\n"
-    " - google-api-python-client (optionnel sauf si usage API)\n\n"
-    "💡 Exemples :\n"
-    "  python youtube_album_search.py --album 'The Warning - ERROR (2022)' --type full --no-api\n"
-    "  python youtube_album_search.py --file albums.txt --type live",
-    formatter_class=argparse.RawTextHelpFormatter,
-)
-group = parser.add_mutually_exclusive_group(required=True)
-group.add_argument(
-    "--album", help="Titre de l'album : 'Artiste - Nom Album (année optionnelle)')"
-)
-group.add_argument("--file", help="Fichier texte avec un album par ligne")
-parser.add_argument(
-    "--type",
-    choices=["full", "live", "cover", "react"],
-    required=True,
-    help="Type de recherche",
-)
-parser.add_argument(
-    "--max-results",
-    type=int,
-    default=DEFAULT_MAX_RESULTS,
-    help="Nombre max de résultats analysés",
-)
-parser.add_argument(
-    "--top", type=int, default=DEFAULT_TOP_RESULTS, help="Nombre de résultats affichés"
-)
-parser.add_argument(
-    "--no-api", action="store_true", help="Utiliser yt-dlp sans API key"
-)
-parser.add_argument("--output", default="results.txt", help="Fichier de sortie")
-args = parser.parse_args()
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Recherche des albums sur YouTube (vidéos ou playlists) avec ou sans clé API.\n\n"
+        "🔧 Dépendances requises :\n"
+        " - yt-dlp\n"
+        " - google-api-python-client (optionnel sauf si usage API)\n"
+        " - regex (optionnel, remplace le module re)\n\n"
+        "💡 Exemples :\n"
+        "  python youtube_album_search.py --album 'The Warning - ERROR (2022)' --type full --no-api\n"
+        "  python youtube_album_search.py --file albums.txt --type live",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "--album", help="Titre de l'album : 'Artiste - Nom Album (année optionnelle)')"
+    )
+    group.add_argument("--file", help="Fichier texte avec un album par ligne")
+    parser.add_argument(
+        "--type",
+        choices=["full", "live", "cover", "react"],
+        required=True,
+        help="Type de recherche",
+    )
+    parser.add_argument(
+        "--max-results",
+        type=int,
+        default=DEFAULT_MAX_RESULTS,
+        help="Nombre max de résultats analysés",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP_RESULTS,
+        help="Nombre de résultats affichés",
+    )
+    parser.add_argument(
+        "--no-api", action="store_true", help="Utiliser yt-dlp sans API key"
+    )
+    parser.add_argument("--output", default="results.txt", help="Fichier de sortie")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Nombre d'albums recherchés en parallèle",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ne pas utiliser le cache disque"
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignorer le cache existant et le remettre à jour",
+    )
+    return parser.parse_args()
 
 
 # --- Formatage durée ---
+@lru_cache(maxsize=4096)
 def format_duration(seconds: int) -> str:
     return str(timedelta(seconds=seconds))
 
 
 # --- Nettoyage du titre ---
+_YEAR_RE = re.compile(r"\(\d{4}\)")
+
+
 def clean_title(title: str) -> str:
-    title = re.sub(r"\(\d{4}\)", "", title)  # Remove (year)
-    title = title.replace("-", " ")
-    return re.sub(r"\s+", " ", title).strip()
+    title = _YEAR_RE.sub("", title)  # Remove (year)
+    return " ".join(title.replace("-", " ").split())
+
+
+# --- Cache disque des recherches ---
+def _cache_path(query: str, max_results: int) -> str:
+    raw = f"{CACHE_VERSION}|{query}|{max_results}"
+    key = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def cache_load(query: str, max_results: int) -> List[Dict] | None:
+    path = _cache_path(query, max_results)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def cache_save(query: str, max_results: int, results: List[Dict]) -> None:
+    path = _cache_path(query, max_results)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Cache non écrit : {e}")
 
 
 # --- yt-dlp wrapper corrigé ---
-def search_youtube_yt_dlp(query: str, max_results: int) -> List[Dict]:
-    ydl_opts = {
-        "quiet": True,
-        "skip_download": True,
-        "default_search": f"ytsearch{max_results}",
-        "dump_single_json": True,
-        "format": "bestaudio/best",
-    }
-    with YoutubeDL(ydl_opts) as ydl:
-        try:
-            result = ydl.extract_info(query, download=False)
-            entries = result.get("entries", [])
-            return [
-                {
-                    "title": entry.get("title"),
-                    "url": entry.get("url"),
-                    "duration": entry.get("duration"),
-                    "webpage_url": entry.get("webpage_url"),
-                    "type": (
-                        "playlist"
-                        if "playlist" in entry.get("webpage_url", "")
-                        else "video"
-                    ),
-                }
-                for entry in entries
-                if entry
-            ]
-        except Exception as e:
-            print(f"Erreur yt-dlp : {e}")
-            return []
+# Une instance YoutubeDL par thread (YoutubeDL n'est pas garanti thread-safe)
+_local = threading.local()
+
+
+def _get_ydl() -> YoutubeDL:
+    ydl = getattr(_local, "ydl", None)
+    if ydl is None:
+        ydl = _local.ydl = YoutubeDL(
+            {
+                "quiet": True,
+                "skip_download": True,
+                # Métadonnées « plates » : pas de résolution des formats par entrée
+                "extract_flat": "in_playlist",
+            }
+        )
+    return ydl
+
+
+def _is_playlist(entry: Dict) -> bool:
+    """Se fie d'abord aux champs fournis par yt-dlp, puis au paramètre list=."""
+    return (
+        entry.get("_type") == "playlist"
+        or entry.get("ie_key") == "YoutubePlaylist"
+        or "list=" in (entry.get("webpage_url") or entry.get("url") or "")
+    )
+
+
+def search_youtube_yt_dlp(
+    query: str, max_results: int, use_cache: bool = True, refresh: bool = False
+) -> List[Dict]:
+    if use_cache and not refresh:
+        cached = cache_load(query, max_results)
+        if cached is not None:
+            return cached
+
+    ydl = _get_ydl()
+    ydl.params["default_search"] = f"ytsearch{max_results}"
+    try:
+        result = ydl.extract_info(query, download=False)
+        entries = result.get("entries", [])
+        results = [
+            {
+                "title": entry.get("title"),
+                "_title_lc": (entry.get("title") or "")[:TITLE_SCAN_MAX].lower(),
+                "url": entry.get("url"),
+                "duration": entry.get("duration"),
+                # en mode plat, seule "url" est garantie
+                "webpage_url": entry.get("webpage_url") or entry.get("url") or "",
+                "type": "playlist" if _is_playlist(entry) else "video",
+            }
+            for entry in entries
+            if entry
+        ]
+    except Exception as e:
+        print(f"Erreur yt-dlp : {e}")
+        return []
+    if use_cache:
+        cache_save(query, max_results, results)
+    return results
 
 
 # --- Filtrage par mots-clés ---
-def filter_results(results: List[Dict], mode: str) -> List[Dict]:
-    blacklist = BLACKLIST_KEYWORDS.get(mode, [])
-    filtered = []
+def filter_results(
+    results: List[Dict], mode: str, top_n: int
+) -> Tuple[List[Dict], List[Dict]]:
+    """Filtre et répartit en (playlists, vidéos) en un seul passage."""
+    rx = _BLACKLIST_RE[mode]
+    playlists, videos = [], []
     for r in results:
-        title = r.get("title", "").lower()
-        if any(bad in title for bad in blacklist):
-            continue
-        if "single" in title:
-            continue
-        if r.get("duration", 0) < 900:
+        # Tests du moins coûteux au plus coûteux
+        if (r.get("duration") or 0) < 900:
             continue  # Moins de 15 min = probablement un single
-        filtered.append(r)
-    return filtered
+        if rx.search(r["_title_lc"]):
+            continue
+        bucket = playlists if r.get("type") == "playlist" else videos
+        if len(bucket) < top_n:
+            bucket.append(r)
+            if len(playlists) >= top_n and len(videos) >= top_n:
+                break
+    return playlists, videos
 
 
 # --- Recherche ---
 def process_album(
-    title: str, search_type: str, max_results: int, top_n: int, no_api: bool
-):
+    title: str,
+    search_type: str,
+    max_results: int,
+    top_n: int,
+    no_api: bool,
+    use_cache: bool = True,
+    refresh_cache: bool = False,
+) -> Dict | None:
     query = clean_title(title)
     search_query = f"{query} {search_type} album"
 
-    print(f"\n🔍 Recherche pour : {query} ({search_type})")
-
-    results = search_youtube_yt_dlp(search_query, max_results)
+    # Sortie tamponnée : affichée d'un bloc pour ne pas mélanger les threads
+    out = io.StringIO()
+    print(f"\n🔍 Recherche pour : {query} ({search_type})", file=out)
 
-    playlists = [r for r in results if r.get("type") == "playlist"]
-    videos = [r for r in results if r.get("type") == "video"]
+    results = search_youtube_yt_dlp(
+        search_query, max_results, use_cache=use_cache, refresh=refresh_cache
+    )
+    if not results:  # erreur yt-dlp ou aucune réponse
+        print(f"{out.getvalue()}   Aucun résultat.", flush=True)
+        return None
 
-    filtered_playlists = filter_results(playlists, search_type)[:top_n]
-    filtered_videos = filter_results(videos, search_type)[:top_n]
+    filtered_playlists, filtered_videos = filter_results(results, search_type, top_n)
+    # Durée formatée une seule fois, réutilisée à l'affichage et dans le fichier
+    for r in filtered_playlists + filtered_videos:
+        r["_dur_str"] = (
+            format_duration(int(r["duration"])) if r.get("duration") else "??:??"
+        )
 
     # Affichage
     def show_section(name: str, section: List[Dict]):
-        print(f"\n📂 {name}")
+        print(f"\n📂 {name}", file=out)
         for i, r in enumerate(section, 1):
-            duration = (
-                format_duration(r.get("duration", 0)) if r.get("duration") else "??:??"
+            print(
+                f"{i}. {r['title']} [{r['_dur_str']}]\n   {r['webpage_url']}",
+                file=out,
             )
-            print(f"{i}. {r['title']} [{duration}]\n   {r.get('webpage_url', '')}")
 
     show_section("Playlists", filtered_playlists)
     show_section("Vidéos", filtered_videos)
+    print(out.getvalue(), end="", flush=True)
 
     return {
         "album": query,
@@ -161,39 +287,64 @@ def process_album(
     }
 
 
+# --- Lecture du fichier d'albums ---
+def iter_entries(path: str) -> Iterator[str]:
+    """Lignes non vides, sans doublons ("Album (2022)" et "Album" comptent pour un)."""
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            key = clean_title(line)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield line
+
+
 # --- Traitement principal ---
 def main():
-    entries = []
+    args = parse_args()
+
+    def run(entry: str) -> Dict | None:
+        return process_album(
+            entry,
+            args.type,
+            args.max_results,
+            args.top,
+            args.no_api,
+            use_cache=not args.no_cache,
+            refresh_cache=args.refresh_cache,
+        )
 
     if args.album:
-        entries.append(args.album)
-    elif args.file:
+        # Un seul album : inutile de monter un pool de threads
+        results = [run(args.album)]
+    else:
         if not os.path.exists(args.file):
             print(f"❌ Fichier introuvable : {args.file}")
             return
-        with open(args.file, "r", encoding="utf-8") as f:
-            entries = [line.strip() for line in f if line.strip()]
+        # Recherches indépendantes et limitées par le réseau : un pool de threads,
+        # alimenté au fil de la lecture du fichier (ordre des résultats conservé)
+        with ThreadPoolExecutor(max_workers=args.workers) as ex:
+            results = list(ex.map(run, iter_entries(args.file)))
 
-    results = []
-    for entry in entries:
-        res = process_album(entry, args.type, args.max_results, args.top, args.no_api)
-        results.append(res)
+    # Albums sans aucun résultat retenu : rien à écrire
+    results = [r for r in results if r and (r["playlists"] or r["videos"])]
 
-    # Sauvegarde fichier
+    # Sauvegarde fichier : contenu assemblé puis écrit en une fois
+    lines = []
+    for res in results:
+        lines.append(f"\n=== {res['album']} ({res['search_type']}) ===\n")
+        for section in ["playlists", "videos"]:
+            lines.append(f"\n{section.upper()}:\n")
+            for r in res[section]:
+                lines.append(
+                    f"- {r['title']} [{r['_dur_str']}]\n  {r['webpage_url']}\n"
+                )
     with open(args.output, "w", encoding="utf-8") as f:
-        for res in results:
-            f.write(f"\n=== {res['album']} ({res['search_type']}) ===\n")
-            for section in ["playlists", "videos"]:
-                f.write(f"\n{section.upper()}:\n")
-                for r in res[section]:
-                    duration = (
-                        format_duration(r.get("duration", 0))
-                        if r.get("duration")
-                        else "??:??"
-                    )
-                    f.write(
-                        f"- {r['title']} [{duration}]\n  {r.get('webpage_url', '')}\n"
-                    )
+        f.write("".join(lines))
     print(f"\n✅ Résultats enregistrés dans {args.output}")
 
 
@@ -24,17 +24,111 @@ Options :
 
 Dépendance :
   pip install musicbrainzngs
+
+Les réponses MusicBrainz sont mises en cache 30 jours (voir mb_cache.py).
 """
 
 from __future__ import annotations
 import argparse
+import functools
 import pathlib
+import random
+import re
 import sys
+import threading
 import time
-from typing import Dict, List, Tuple
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Tuple
 
 import musicbrainzngs as mb
 
+from mb_cache import mb_cached
+
+
+# ---------------------------------------------------------------------------
+# Limitation du débit MusicBrainz (1 requête/s)
+# ---------------------------------------------------------------------------
+
+
+class MBThrottle:
+    """
+    Espace les requêtes d'au moins 'interval' secondes, en tenant compte du
+    temps déjà écoulé depuis la précédente (on n'attend que le reliquat).
+    Partagé entre threads : seuls les *départs* de requêtes sont espacés, les
+    réponses peuvent donc se chevaucher.
+    """
+
+    def __init__(self, interval: float = 1.05):
+        self.interval = interval
+        self.last = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            delta = time.monotonic() - self.last
+            if delta < self.interval:
+                time.sleep(self.interval - delta)
+            self.last = time.monotonic()
+
+
+throttle = MBThrottle()
+MAX_IN_FLIGHT = 3  # requêtes de pistes en vol simultanément
+MAX_RETRIES = 10
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float | None:
+    """
+    Délai avant un nouvel essai, ou None si l'erreur est définitive.
+    musicbrainzngs réessaie déjà lui-même les 500/502/503, puis lève
+    NetworkError(cause=HTTPError) : on ne réessaie que sur 503 (en respectant
+    l'en-tête Retry-After) ou sur une vraie erreur de connexion.
+    """
+    cause = getattr(exc, "cause", None)
+    if isinstance(cause, urllib.error.HTTPError):
+        if cause.code != 503:
+            return None
+        retry_after = cause.headers.get("Retry-After") if cause.headers else None
+        if retry_after and retry_after.strip().isdigit():
+            return float(retry_after)
+    elif isinstance(exc, mb.ResponseError):
+        return None  # réponse illisible : réessayer n'y changera rien
+    return min(60, 2**attempt + random.random())
+
+
+def mb_call(fn, *args, **kwargs):
+    """Appel MusicBrainz limité en débit, réessayé sur 503 / erreur réseau."""
+    for attempt in range(MAX_RETRIES):
+        throttle.wait()
+        try:
+            return fn(*args, **kwargs)
+        except (mb.NetworkError, mb.ResponseError) as exc:
+            delay = _retry_delay(exc, attempt)
+            if delay is None or attempt == MAX_RETRIES - 1:
+                raise
+            if attempt == 0:
+                print(f"⚠️  MusicBrainz indisponible ({exc}), nouvel essai…")
+            time.sleep(delay)
+
+
+def throttled(func):
+    """Enveloppe 'func' dans mb_call (limite de débit + nouveaux essais)."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return mb_call(func, *args, **kwargs)
+
+    return wrapper
+
+
+# Appels MusicBrainz : cache disque d'abord, limite de débit seulement si
+# la requête part réellement sur le réseau.
+search_artists = mb_cached()(throttled(mb.search_artists))
+browse_release_groups = mb_cached()(throttled(mb.browse_release_groups))
+browse_releases = mb_cached()(throttled(mb.browse_releases))
+get_release_by_id = mb_cached()(throttled(mb.get_release_by_id))
+get_artist_by_id = mb_cached()(throttled(mb.get_artist_by_id))
+
 
 # ---------------------------------------------------------------------------
 # Recherche / sélection de l'artiste
@@ -46,7 +140,13 @@ def find_artist_id(name: str) -> str | None:
     Recherche un artiste dont le nom correspond exactement à 'name'
     (casse ignorée). Si rien ne correspond, renvoie l'ID du 1er résultat.
     """
-    res = mb.search_artists(query=f'artist:"{name}"', limit=25)
+    # Clé normalisée : "Metallica " et "metallica" partagent la même entrée
+    return _find_artist_id(name.strip().lower())
+
+
+@functools.lru_cache(maxsize=256)
+def _find_artist_id(name: str) -> str | None:
+    res = search_artists(query=f'artist:"{name}"', limit=25)
 
     if not res["artist-list"]:
         return None
@@ -68,7 +168,6 @@ def find_artist_id(name: str) -> str | None:
 # ---------------------------------------------------------------------------
 
 AlbumInfo = Dict[str, str]  # keys: title, year, rgid
-TrackDict = Dict[str, List[str]]  # rgid -> [track titles]
 
 
 def get_albums(artist_id: str, include_live: bool) -> List[AlbumInfo]:
@@ -77,31 +176,34 @@ def get_albums(artist_id: str, include_live: bool) -> List[AlbumInfo]:
     - Par défaut on exclut ceux dont le type secondaire est 'Live'.
     - 'include_live=True' ajoute ces albums live.
     """
-    rgs = mb.browse_release_groups(
+    rgs = browse_release_groups(
         artist=artist_id,
         release_type="album",
         limit=200,
     )["release-group-list"]
 
     seen = set()
-    albums: List[AlbumInfo] = []
+    keyed: List[Tuple[Tuple[str, str], AlbumInfo]] = []
 
     for rg in rgs:
         title = rg["title"]
-        if title.lower() in seen:
+        t_low = title.lower()
+        if t_low in seen:
             continue
-        seen.add(title.lower())
+        seen.add(t_low)
 
-        secondary = [t.lower() for t in rg.get("secondary-type-list", [])]
-        is_live = "live" in secondary
-        if is_live and not include_live:
+        if not include_live and any(
+            t.lower() == "live" for t in rg.get("secondary-type-list", ())
+        ):
             continue
 
         year = rg.get("first-release-date", "")[:4]  # AAAA ou vide
-        albums.append({"title": title, "year": year, "rgid": rg["id"]})
+        # Clé de tri calculée une fois (année puis titre en minuscules)
+        album = {"title": title, "year": year, "rgid": rg["id"]}
+        keyed.append(((year or "9999", t_low), album))
 
-    albums.sort(key=lambda d: (d["year"] or "9999", d["title"].lower()))
-    return albums
+    keyed.sort(key=lambda kv: kv[0])
+    return [alb for _, alb in keyed]
 
 
 # ---------------------------------------------------------------------------
@@ -114,31 +216,61 @@ def choose_release(releases: List[dict]) -> dict:
     Dans la liste de releases d'un même release-group, tente de choisir la plus
     pertinente : d'abord 'Official', sinon la première.
     """
-    for rel in releases:
-        if rel.get("status", "").lower() == "official":
-            return rel
-    return releases[0]
+    statuses = tuple(rel.get("status", "").lower() for rel in releases)
+    return releases[_choose_release_index(statuses)]
+
 
+@functools.lru_cache(maxsize=1024)
+def _choose_release_index(statuses: Tuple[str, ...]) -> int:
+    for idx, status in enumerate(statuses):
+        if status == "official":
+            return idx
+    return 0
 
-def get_tracks_for_release_group(rgid: str) -> List[str]:
+
+def get_releases_by_rg(artist_id: str, rgids: Set[str]) -> Dict[str, List[dict]]:
     """
-    Renvoie la liste (ordonnée) des titres de pistes d'un release-group.
+    Récupère par requêtes paginées les releases 'album' de l'artiste, regroupées
+    par release-group (rgid -> [releases]). Évite un browse_releases par album.
+    Coût : ceil(R/100) requêtes au plus, R comptant toutes les rééditions ;
+    on s'arrête dès que chaque release-group de 'rgids' a au moins une release.
     """
-    # 1. Trouver une release représentative
-    rels = mb.browse_releases(
-        release_group=rgid,
-        includes=[],
-        limit=25,
-    )["release-list"]
-
-    if not rels:
+    by_rg: Dict[str, List[dict]] = {}
+    missing = set(rgids)
+    offset = 0
+    while True:
+        res = browse_releases(
+            artist=artist_id,
+            release_type=["album"],
+            includes=["release-groups"],
+            limit=100,
+            offset=offset,
+        )
+        rels = res["release-list"]
+        for rel in rels:
+            rg = rel.get("release-group")
+            if rg:
+                by_rg.setdefault(rg["id"], []).append(rel)
+                missing.discard(rg["id"])
+        offset += len(rels)
+        if not missing or not rels or offset >= res.get("release-count", 0):
+            return by_rg
+
+
+def get_tracks_for_release_group(releases: List[dict]) -> List[str]:
+    """
+    Renvoie la liste (ordonnée) des titres de pistes d'un release-group,
+    à partir de ses releases déjà connues (voir get_releases_by_rg).
+    """
+    if not releases:
         return []
 
-    release = choose_release(rels)
+    # 1. Choisir une release représentative
+    release = choose_release(releases)
     release_id = release["id"]
 
     # 2. Récupérer les pistes de cette release
-    rel_data = mb.get_release_by_id(release_id, includes=["recordings"])
+    rel_data = get_release_by_id(release_id, includes=["recordings"])
     tracks: List[str] = []
     for medium in rel_data["release"].get("medium-list", []):
         for track in medium.get("track-list", []):
@@ -151,6 +283,9 @@ def get_tracks_for_release_group(rgid: str) -> List[str]:
 # Main
 # ---------------------------------------------------------------------------
 
+# Tout caractère non alphanumérique (Unicode compris) devient "_"
+_UNSAFE_CHAR_RE = re.compile(r"[\W_]")
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -167,11 +302,14 @@ def main() -> None:
         parser.error("indiquez un nom d'artiste ou --mbid.")
 
     mb.set_useragent("AlbumLister/1.6", "https://example.com", "email@example.com")
+    # Le débit est géré par MBThrottle : on désactive la limite de la bibliothèque
+    mb.set_rate_limit(False)
 
     # Sélection de l'artiste
     if args.mbid:
         artist_id = args.mbid
-        artist_name = args.artist or "Artiste"
+        # Nom réel de l'artiste si non fourni (une requête, mise en cache)
+        artist_name = args.artist or get_artist_by_id(artist_id)["artist"]["name"]
     else:
         artist_name = args.artist
         artist_id = find_artist_id(artist_name)
@@ -185,42 +323,42 @@ def main() -> None:
         print("⚠️  Aucun album trouvé.")
         sys.exit(0)
 
-    # Récupération des pistes (avec respect des limites API)
-    print("⏳  Téléchargement des listes de pistes…")
-    tracks_by_rg: TrackDict = {}
-    for idx, alb in enumerate(albums, 1):
-        tracks_by_rg[alb["rgid"]] = get_tracks_for_release_group(alb["rgid"])
-        time.sleep(1)  # MusiqueBrainz recommande 1 requête/s
-        print(
-            f"  • {idx}/{len(albums)} {alb['title']} ({len(tracks_by_rg[alb['rgid']])} pistes)"
-        )
-
-    # Écriture du fichier
-    safe = "".join(c if c.isalnum() else "_" for c in artist_name.lower())
+    safe = _UNSAFE_CHAR_RE.sub("_", artist_name.lower())
     path = pathlib.Path(f"albums_{safe}.txt")
     sep_line = "-" * 60
 
+    # En-têtes "Artiste - Album (AAAA)" formatés une seule fois
+    headers = [
+        f"{artist_name} - {alb['title']}"
+        + (f" ({alb['year']})" if alb["year"] else "")
+        + "\n"
+        for alb in albums
+    ]
+
     with path.open("w", encoding="utf-8") as f:
-        # Section 1 : albums
-        for alb in albums:
-            line = f"{artist_name} - {alb['title']}"
-            if alb["year"]:
-                line += f" ({alb['year']})"
-            f.write(line + "\n")
-
-        # Séparation
+        # Section 1 : albums, puis séparation (pas besoin des pistes)
+        f.writelines(headers)
         f.write(sep_line + "\n")
 
-        # Section 2 : albums + pistes
-        for alb in albums:
-            line = f"{artist_name} - {alb['title']}"
-            if alb["year"]:
-                line += f" ({alb['year']})"
-            f.write(line + "\n")
-
-            for track in tracks_by_rg.get(alb["rgid"], []):
-                f.write(f"    {track}\n")
-            f.write("\n")  # ligne blanche entre albums
+        # Section 2 : chaque album est écrit dès que ses pistes sont connues
+        # (limite API respectée par MBThrottle)
+        print("⏳  Téléchargement des listes de pistes…")
+        releases_by_rg = get_releases_by_rg(artist_id, {a["rgid"] for a in albums})
+        # Requêtes pipelinées : la suivante part pendant qu'on attend la réponse
+        with ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT) as ex:
+            fetched = ex.map(
+                lambda alb: get_tracks_for_release_group(
+                    releases_by_rg.get(alb["rgid"], [])
+                ),
+                albums,
+            )
+            for idx, (header, alb, tracks) in enumerate(
+                zip(headers, albums, fetched), 1
+            ):
+                f.write(header)
+                f.writelines(f"    {track}\n" for track in tracks)
+                f.write("\n")  # ligne blanche entre albums
+                print(f"  • {idx}/{len(albums)} {alb['title']} ({len(tracks)} pistes)")
 
     tag = " (incluant Live)" if args.live else ""
     print(f"✅  Fichier généré : {path.resolve()}{tag}")
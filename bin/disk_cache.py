@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+disk_cache.py
+
+Mémorisation sur disque (SQLite) du résultat d'une fonction ou d'une
+coroutine, partagée par les scripts de recherche YouTube.
+
+Usage :
+    from disk_cache import disk_memoize
+
+    @disk_memoize(CACHE_DB, 7 * 86400, key=lambda term, *_: term)
+    def search_best(term): ...
+
+    search_best.enabled = not args.no_cache  # --no-cache
+    search_best.ttl = args.cache_ttl         # --cache-ttl
+
+Les résultats sont picklés dans la table (key TEXT PRIMARY KEY, value BLOB,
+ts INTEGER), clé = sha1(key(*args, **kwargs)).
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Callable
+
+_MISS = object()
+
+
+def _lookup(path: str, k: str, wrapper) -> Any:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB, ts INTEGER)"
+        )
+        row = db.execute("SELECT value, ts FROM cache WHERE key = ?", (k,)).fetchone()
+    # désactivé (--no-cache) : on recalcule, mais le résultat est réécrit
+    if wrapper.enabled and row and time.time() - row[1] < wrapper.ttl:
+        return pickle.loads(row[0])
+    return _MISS
+
+
+def _store(path: str, k: str, res: Any) -> None:
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+            (k, pickle.dumps(res), int(time.time())),
+        )
+
+
+def disk_memoize(path, ttl: int, key: Callable[..., str]):
+    """
+    Décorateur : renvoie le résultat en cache s'il a moins de `wrapper.ttl`
+    secondes, sinon appelle la fonction (ou attend la coroutine) et le stocke.
+    `wrapper.enabled` / `wrapper.ttl` sont réglables depuis la CLI.
+    """
+    path = os.fspath(path)
+
+    def deco(func: Callable) -> Callable:
+        def make_key(*args: Any, **kwargs: Any) -> str:
+            return hashlib.sha1(key(*args, **kwargs).encode("utf-8")).hexdigest()
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                k = make_key(*args, **kwargs)
+                res = _lookup(path, k, wrapper)
+                if res is _MISS:
+                    res = await func(*args, **kwargs)
+                    _store(path, k, res)
+                return res
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                k = make_key(*args, **kwargs)
+                res = _lookup(path, k, wrapper)
+                if res is _MISS:
+                    res = func(*args, **kwargs)
+                    _store(path, k, res)
+                return res
+
+        wrapper.enabled = True
+        wrapper.ttl = ttl
+        return wrapper
+
+    return deco
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+mb_cache.py
+
+Cache disque (SQLite) des réponses MusicBrainz, pour que les exécutions
+répétées d'un script ne refassent pas les mêmes requêtes limitées à 1/s.
+
+Usage :
+    from mb_cache import mb_cached
+
+    search_artists = mb_cached()(mb.search_artists)
+    search_artists(query='artist:"Metallica"', limit=25)
+
+Les réponses sont picklées puis compressées (gzip) dans
+~/.cache/album_lister/mb.sqlite, table (key BLOB PRIMARY KEY, value BLOB,
+created INTEGER).
+"""
+
+from __future__ import annotations
+import functools
+import gzip
+import hashlib
+import pathlib
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+DEFAULT_DB = pathlib.Path.home() / ".cache" / "album_lister" / "mb.sqlite"
+DEFAULT_TTL = 30 * 86400  # 30 jours
+
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+
+
+def _db() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        DEFAULT_DB.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(DEFAULT_DB, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key BLOB PRIMARY KEY, value BLOB, created INTEGER)"
+        )
+    return _conn
+
+
+def _make_key(name: str, args: tuple, kwargs: dict) -> bytes:
+    raw = repr((name, args, sorted(kwargs.items())))
+    return hashlib.sha1(raw.encode("utf-8")).digest()
+
+
+def mb_cached(ttl: int = DEFAULT_TTL) -> Callable[[Callable], Callable]:
+    """
+    Décorateur : renvoie la réponse en cache si elle a moins de 'ttl' secondes,
+    sinon appelle la fonction et stocke son résultat.
+    """
+
+    def deco(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _make_key(func.__name__, args, kwargs)
+            with _lock:
+                row = _db().execute(
+                    "SELECT value, created FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+            if row and time.time() - row[1] < ttl:
+                return pickle.loads(gzip.decompress(row[0]))
+
+            result = func(*args, **kwargs)
+            blob = gzip.compress(pickle.dumps(result))
+            with _lock:
+                conn = _db()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                    (key, blob, int(time.time())),
+                )
+                conn.commit()
+            return result
+
+        return wrapper
+
+    return deco
@@ -1,11 +1,13 @@
 import argparse
 import sys
 import os
+from urllib.parse import urlparse, parse_qs
 from yt_dlp import YoutubeDL
 
 
 def is_playlist(url: str) -> bool:
-    return "playlist" in url or "list=" in url
+    q = urlparse(url)
+    return "list" in parse_qs(q.query) or q.path.startswith("/playlist")
 
 
 def get_ydl_options(output_format: str, is_audio: bool) -> dict:
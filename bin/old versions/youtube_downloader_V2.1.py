@@ -41,22 +41,35 @@ class ProgressBar:
             total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
             downloaded = d.get('downloaded_bytes', 0)
             if not self.bar and total:
-                self.bar = tqdm(total=total, unit='B', unit_scale=True, desc=d.get('filename', 'Téléchargement'))
+                # Affichage limité en fréquence : yt-dlp appelle le hook très souvent
+                self.bar = tqdm(total=total, unit='B', unit_scale=True, desc=d.get('filename', 'Téléchargement'),
+                                mininterval=0.25, maxinterval=1.0, miniters=1 << 20)
             if self.bar:
-                self.bar.n = downloaded
-                self.bar.refresh()
+                self.bar.update(downloaded - self.bar.n)
         elif d['status'] == 'finished' and self.bar:
             self.bar.n = self.bar.total
             self.bar.close()
             self.bar = None
 
 def get_video_list(url: str) -> list:
+    # Vidéo seule (pas de paramètre list=) : rien à lister, pas de requête réseau
+    if 'list=' not in url and ('watch?v=' in url or 'youtu.be/' in url):
+        return [url]
     urls = []
-    with YoutubeDL({'quiet': True, 'extract_flat': True, 'forcejson': True}) as ydl:
+    opts = {
+        'quiet': True,
+        'extract_flat': 'in_playlist',  # pas de requête par vidéo
+        'skip_download': True,
+        'ignoreerrors': True,
+        'socket_timeout': 10,
+    }
+    with YoutubeDL(opts) as ydl:
         try:
             info = ydl.extract_info(url, download=False)
         except DownloadError as e:
             raise Exception(f"Erreur lors de l'analyse de l'URL : {e}")
+        if not info:
+            raise Exception("Erreur lors de l'analyse de l'URL : aucune information")
 
         if '_type' in info and info['_type'] == 'playlist':
             for entry in info['entries']:
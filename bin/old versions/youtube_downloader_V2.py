@@ -1,6 +1,7 @@
 import argparse
 import os
 import sys
+from urllib.parse import urlparse, parse_qs
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError
 from tqdm import tqdm
@@ -47,23 +48,36 @@ class ProgressBar:
             total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
             downloaded = d.get('downloaded_bytes', 0)
             if not self.bar and total:
-                self.bar = tqdm(total=total, unit='B', unit_scale=True, desc=d.get('filename', 'Téléchargement'))
+                # Affichage limité en fréquence : yt-dlp appelle le hook très souvent
+                self.bar = tqdm(total=total, unit='B', unit_scale=True, desc=d.get('filename', 'Téléchargement'),
+                                mininterval=0.25, maxinterval=1.0, miniters=1 << 20)
             if self.bar:
-                self.bar.n = downloaded
-                self.bar.refresh()
+                self.bar.update(downloaded - self.bar.n)
         elif d['status'] == 'finished' and self.bar:
             self.bar.n = self.bar.total
             self.bar.close()
             self.bar = None
 
 def is_playlist(url: str) -> bool:
-    return "playlist" in url or "list=" in url
+    q = urlparse(url)
+    return "list" in parse_qs(q.query) or q.path.startswith("/playlist")
 
 def get_video_list(url: str) -> list:
-    with YoutubeDL({'quiet': True, 'extract_flat': True, 'forcejson': True}) as ydl:
+    # Vidéo seule (pas de paramètre list=) : rien à lister, pas de requête réseau
+    if not is_playlist(url) and ('watch?v=' in url or 'youtu.be/' in url):
+        return [url]
+    opts = {
+        'quiet': True,
+        'extract_flat': 'in_playlist',  # pas de requête par vidéo
+        'skip_download': True,
+        'ignoreerrors': True,
+        'socket_timeout': 10,
+    }
+    with YoutubeDL(opts) as ydl:
         info = ydl.extract_info(url, download=False)
-        if '_type' in info and info['_type'] == 'playlist':
-            return [entry['url'] for entry in info['entries']]
+        # ignoreerrors : info vaut None en cas d'échec, le téléchargement le signalera
+        if info and info.get('_type') == 'playlist':
+            return [entry['url'] for entry in info['entries'] if entry]
         else:
             return [url]
 
@@ -11,21 +11,23 @@
 # • Toutes les autres fonctionnalités antérieures restent inchangées
 
 import argparse
+import functools
 import os
 import re
 import sys
 import time
 import threading
-import queue
+from concurrent.futures import ThreadPoolExecutor
 from yt_dlp import YoutubeDL, DownloadError
 from tqdm import tqdm
 
 # ──────────────────────────  utilitaires  ──────────────────────────
-INVALID_FS = r'[\\/*?:"<>|]'
+INVALID_FS = re.compile(r'[\\/*?:"<>|]')
 
+@functools.lru_cache(maxsize=512)
 def sanitize(name: str) -> str:
     """Nettoie un nom pour un système de fichiers générique."""
-    name = re.sub(INVALID_FS, "_", name).strip().rstrip(".")
+    name = INVALID_FS.sub("_", name).strip().rstrip(".")
     return name[:100] or "output"
 
 # ───────────────────────  barre par vidéo  ───────────────────────
@@ -38,16 +40,23 @@ class ProgressBar:
             total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
             done  = d.get("downloaded_bytes", 0)
             if not self.bar and total:
+                # Affichage limité en fréquence : yt-dlp appelle le hook très souvent
                 self.bar = tqdm(total=total, unit="B", unit_scale=True,
-                                desc=d.get("filename", "Téléchargement"))
+                                desc=d.get("filename", "Téléchargement"),
+                                mininterval=0.25, maxinterval=1.0, miniters=1 << 20)
             if self.bar:
-                self.bar.n = done
-                self.bar.refresh()
+                self.bar.update(done - self.bar.n)
         elif d["status"] == "finished" and self.bar:
             self.bar.n = self.bar.total
             self.bar.close()
             self.bar = None
 
+# Options yt-dlp communes, construites une fois pour toute l'exécution
+BASE_YDL = {"quiet": True, "socket_timeout": 10}
+EXTRACT_YDL = {**BASE_YDL, "skip_download": True, "ignoreerrors": True}
+SEARCH_YDL = {**EXTRACT_YDL, "extract_flat": True}          # plus rapide
+LIST_YDL = {**EXTRACT_YDL, "extract_flat": "in_playlist"}
+
 # ─────────────────────── 1) Recherche mixte ───────────────────────
 def score_entry(e: dict) -> tuple[int, str]:
     """Retourne (score, 'playlist'|'video')."""
@@ -63,55 +72,48 @@ def score_entry(e: dict) -> tuple[int, str]:
     score = views + bonus
     return score, "video"
 
-def _search_worker(out_q: queue.Queue, query: str):
-    """Thread worker : exécute yt_dlp avec extract_flat."""
-    opts = {
-        "quiet": True,
-        "extract_flat": True,          # plus rapide
-        "skip_download": True,
-        "ignoreerrors": True,
-        "forcejson": True,
-        "socket_timeout": 10,
-    }
-    try:
-        with YoutubeDL(opts) as ydl:
-            res = ydl.extract_info(query, download=False)
-        out_q.put(("ok", res))
-    except Exception as e:
-        out_q.put(("err", e))
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=4)
+
+def _search_worker(query: str) -> dict:
+    """Exécuté dans _SEARCH_POOL : yt_dlp avec extract_flat."""
+    with YoutubeDL(dict(SEARCH_YDL)) as ydl:  # copie : yt-dlp écrit dans ses params
+        return ydl.extract_info(query, download=False)
 
 def search_best(term: str, verbose: bool = False) -> str:
     """
     Retourne l'URL de la meilleure playlist OU vidéo pour la requête.
     Affiche un spinner pendant la requête et un log des scores.
     """
-    queries = [
-        f"ytsearch20:{term}",               # résultats mixtes
-        f"ytsearch20:{term} full album"     # deuxième tentative
-    ]
+    queries = [f"ytsearch20:{term}"]           # résultats mixtes
+    tl = term.lower()
+    if "full album" not in tl and "official" not in tl:
+        # deuxième tentative, sauf si la requête contient déjà ces mots-clés
+        queries.append(f"ytsearch20:{term} full album")
     best_entry, best_score, best_type = None, -1, ""
 
     for qi, qstr in enumerate(queries, 1):
         print(f"🔍  ({qi}/{len(queries)}) Recherche : {qstr}")
-        q = queue.Queue()
         t0 = time.time()
-        th = threading.Thread(target=_search_worker, args=(q, qstr), daemon=True)
-        th.start()
+        fut = _SEARCH_POOL.submit(_search_worker, qstr)
+        done = threading.Event()
+        fut.add_done_callback(lambda _: done.set())
 
         # spinner
         spin = tqdm(total=0, bar_format="{desc}")
         frames = "|/-\\"
-        k = 0
-        while th.is_alive():
-            spin.set_description(f"Recherche YouTube {frames[k % 4]}")
-            k += 1
-            time.sleep(0.2)
+        shown = -1
+        # wait() rend la main dès la fin de la requête (pas d'attente résiduelle)
+        while not done.wait(0.1):
+            k = int(time.monotonic() * 5) % 4
+            if k != shown:  # on ne redessine que si l'image change
+                spin.set_description(f"Recherche YouTube {frames[k]}")
+                shown = k
         spin.close()
 
-        status, data = q.get()
-        if status == "err":
-            print(f"   ⚠️  Erreur : {data}")
+        if fut.exception():
+            print(f"   ⚠️  Erreur : {fut.exception()}")
             continue
+        data = fut.result()
 
         entries = data.get("entries") or []
         print(f"   • {len(entries)} résultat(s) en {time.time()-t0:.1f}s")
@@ -151,15 +153,7 @@ def search_best(term: str, verbose: bool = False) -> str:
 
 # ─────────────────────── 2) Extraction vidéos ───────────────────────
 def get_video_list(link: str, verbose: bool = False):
-    opts = {
-        "quiet": True,
-        "extract_flat": "in_playlist",
-        "skip_download": True,
-        "ignoreerrors": True,
-        "forcejson": True,
-        "socket_timeout": 10,
-    }
-    with YoutubeDL(opts) as ydl:
+    with YoutubeDL(dict(LIST_YDL)) as ydl:  # copie : yt-dlp écrit dans ses params
         info = ydl.extract_info(link, download=False)
 
     is_pl = info.get("_type") == "playlist"
@@ -186,10 +180,9 @@ def get_video_list(link: str, verbose: bool = False):
 # ─────────────────────── 3) Options yt-dlp  ───────────────────────
 def ydl_options(fmt: str, outdir: str, hook, thumb: bool) -> dict:
     o = {
+        **BASE_YDL,
         "outtmpl": os.path.join(outdir, "%(title)s.%(ext)s"),
         "progress_hooks": [hook],
-        "quiet": True,
-        "socket_timeout": 10,
     }
     if fmt == "mp3":
         o.update({
@@ -217,13 +210,15 @@ def download_all(vids, fmt, outdir, thumb, verbose=False, ctx=""):
     print(f"\n⏬  {ctx}  → dossier : {outdir}")
     bar = tqdm(total=len(vids), desc="Total", unit="vidéo")
     fails = []
+    # Options calculées une fois par liste ; seul le hook change par vidéo
+    base_opts = ydl_options(fmt, outdir, None, thumb)
 
     for v in vids:
         if verbose:
             print(f"   → {v}")
         pb = ProgressBar()
         try:
-            with YoutubeDL(ydl_options(fmt, outdir, pb.hook, thumb)) as ydl:
+            with YoutubeDL({**base_opts, "progress_hooks": [pb.hook]}) as ydl:
                 ydl.download([v])
         except DownloadError as e:
             print(f"[Erreur] {v}\n        ↳ {e}")
@@ -238,8 +233,12 @@ def download_all(vids, fmt, outdir, thumb, verbose=False, ctx=""):
 
 # ─────────────────────── 5) Lecture fichier texte ───────────────────────
 def read_file(path):
+    """Lignes utiles (ni vides ni commentaires), produites au fil de la lecture."""
     with open(path, encoding="utf-8") as f:
-        return [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
+        for ln in f:
+            s = ln.strip()
+            if s and not s.startswith("#"):
+                yield s
 
 # ─────────────────────── 6) Interface CLI  ───────────────────────
 HELP_TEXT = """
@@ -10,31 +10,55 @@
 # • Toutes les fonctionnalités (file, miniatures, barres de progression) conservées
 
 import argparse
+import asyncio
+import contextlib
+import functools
+import itertools
 import os
 import re
 import sys
 import time
 import threading
-import queue
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from yt_dlp import YoutubeDL, DownloadError
 from tqdm import tqdm
 
+# module partagé disk_cache.py : dans bin/, dossier parent de ce script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from disk_cache import disk_memoize  # noqa: E402
+
 # ──────────────────────────  utilitaires  ──────────────────────────
-INVALID_FS = r'[\\/*?:"<>|]'
+INVALID_FS = re.compile(r'[\\/*?:"<>|]')
 
 
+@functools.lru_cache(maxsize=512)
 def sanitize(name: str) -> str:
     """Nettoie un nom pour un système de fichiers générique."""
-    name = re.sub(INVALID_FS, "_", name).strip().rstrip(".")
+    name = INVALID_FS.sub("_", name).strip().rstrip(".")
     return name[:100] or "output"
 
 
+# ──────────────────────────  cache disque  ──────────────────────────
+CACHE_DB = os.path.expanduser("~/.cache/yt_dl/search.sqlite")
+CACHE_TTL = 7 * 86400  # 7 jours
+
+
 # ───────────────────────  barre de progression par vidéo  ───────────────────────
 class ProgressBar:
-    def __init__(self):
+    def __init__(self, position=None):
         self.bar = None
+        self.vid = None
+        self.position = position  # ligne tqdm dédiée (téléchargements parallèles)
 
     def hook(self, d):
+        # Hook partagé entre les vidéos d'une liste : nouvelle vidéo → nouvelle barre
+        vid = (d.get("info_dict") or {}).get("id")
+        if vid != self.vid:
+            self.vid = vid
+            if self.bar:
+                self.bar.close()
+                self.bar = None
         if d["status"] == "downloading":
             total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
             done = d.get("downloaded_bytes", 0)
@@ -44,10 +68,15 @@ class ProgressBar:
                     unit="B",
                     unit_scale=True,
                     desc=d.get("filename", "Téléchargement"),
+                    position=self.position,
+                    leave=self.position is None,
+                    # affichage limité en fréquence : le hook est appelé très souvent
+                    mininterval=0.25,
+                    maxinterval=1.0,
+                    miniters=1 << 20,
                 )
             if self.bar:
-                self.bar.n = done
-                self.bar.refresh()
+                self.bar.update(done - self.bar.n)
         elif d["status"] == "finished" and self.bar:
             self.bar.n = self.bar.total
             self.bar.close()
@@ -55,10 +84,20 @@ class ProgressBar:
 
 
 # ─────────────────────── 1) Recherche mixte playlist / vidéo  ───────────────────────
+# Résultat de search_best : 'entries' = URLs vidéo déjà connues (None → à lister)
+SearchResult = namedtuple("SearchResult", "url entries is_playlist title")
+
+
+TITLE_BONUS = {"full album": 100, "official": 50}
+
+
 def score_entry(e: dict) -> tuple[int, str]:
     """Retourne (score, 'playlist'|'video')."""
-    title = (e.get("title") or "").lower()
-    bonus = 100 * ("full album" in title) + 50 * ("official" in title)
+    # Titre en minuscules calculé une fois et conservé sur l'entrée
+    title = e.get("_title_l")
+    if title is None:
+        title = e["_title_l"] = (e.get("title") or "").lower()
+    bonus = sum(v for k, v in TITLE_BONUS.items() if k in title)
 
     if e.get("_type") == "playlist":
         score = (e.get("playlist_count") or 0) + bonus
@@ -70,7 +109,7 @@ def score_entry(e: dict) -> tuple[int, str]:
     return score, "video"
 
 
-def _search_worker(out_q: queue.Queue, query: str):
+def _run_search(query: str) -> dict:
     opts = {
         "quiet": True,
         "extract_flat": True,  # plus rapide
@@ -79,64 +118,84 @@ def _search_worker(out_q: queue.Queue, query: str):
         "forcejson": True,
         "socket_timeout": 10,
     }
-    try:
-        with YoutubeDL(opts) as ydl:
-            info = ydl.extract_info(query, download=False)
-        out_q.put(("ok", info))
-    except Exception as exc:
-        out_q.put(("err", exc))
-
+    with YoutubeDL(opts) as ydl:
+        return ydl.extract_info(query, download=False)
 
-def search_best(term: str, verbose: bool = False) -> str:
-    """Renvoie l'URL de la meilleure playlist OU vidéo pour `term`."""
-    queries = [f"ytsearch20:{term}", f"ytsearch20:{term} full album"]
-    best_entry, best_score, best_type = None, -1, ""
 
-    for qi, qstr in enumerate(queries, 1):
-        print(f"🔍  ({qi}/{len(queries)}) Recherche : {qstr}")
-        q = queue.Queue()
-        t0 = time.time()
-        th = threading.Thread(target=_search_worker, args=(q, qstr), daemon=True)
-        th.start()
+async def _search_with_spinner(queries: list[str]) -> list:
+    """
+    Lance les recherches (bloquantes) en parallèle dans l'exécuteur, spinner
+    pendant l'attente. Renvoie un résultat ou une exception par requête.
+    """
+    loop = asyncio.get_running_loop()
+    futs = [loop.run_in_executor(None, _run_search, q) for q in queries]
+    spin = tqdm(total=0, bar_format="{desc}")
 
-        # spinner
-        spin = tqdm(total=0, bar_format="{desc}")
+    async def _spinner():
         frames = "|/-\\"
         k = 0
-        while th.is_alive():
+        while True:
             spin.set_description(f"Recherche YouTube {frames[k % 4]}")
             k += 1
-            time.sleep(0.2)
+            await asyncio.sleep(0.1)
+
+    task = asyncio.create_task(_spinner())
+    try:
+        return await asyncio.gather(*futs, return_exceptions=True)
+    finally:
+        task.cancel()
         spin.close()
 
-        status, data = q.get()
-        if status == "err":
-            print(f"   ⚠️  Erreur : {data}")
-            continue
 
-        entries = data.get("entries") or []
-        print(f"   • {len(entries)} résultat(s) en {time.time()-t0:.1f}s")
+@disk_memoize(CACHE_DB, CACHE_TTL, key=lambda term, *a, **kw: f"{term}|best2")
+def search_best(term: str, verbose: bool = False) -> SearchResult:
+    """Renvoie la meilleure playlist OU vidéo pour `term` (cf. SearchResult)."""
+    tl = term.lower()
+    # mots-clés déjà présents : la requête « full album » ferait doublon
+    if "full album" in tl or "official" in tl:
+        queries = [f"ytsearch20:{term}"]
+    else:
+        queries = [f"ytsearch20:{term}", f"ytsearch20:{term} full album"]
+    best_entry, best_score, best_type = None, -1, ""
 
-        bar = tqdm(total=len(entries), desc="Évaluation", unit="résultat")
-        for idx, e in enumerate(entries, 1):
-            bar.update(1)
+    # Les deux requêtes partent ensemble et leurs résultats sont évalués
+    # ensemble : un seul aller-retour réseau au lieu de deux
+    for qstr in queries:
+        print(f"🔍  Recherche : {qstr}")
+    t0 = time.time()
+    results = asyncio.run(_search_with_spinner(queries))
+
+    entries, seen = [], set()
+    for qstr, data in zip(queries, results):
+        if isinstance(data, Exception):
+            print(f"   ⚠️  Erreur ({qstr}) : {data}")
+            continue
+        for e in (data or {}).get("entries") or []:
             if not e:
                 continue
-            sc, kind = score_entry(e)
-            if verbose:
-                tit = e.get("title") or "(titre inconnu)"
-                metric = (
-                    f"vidéos:{e.get('playlist_count')}"
-                    if kind == "playlist"
-                    else f"vues:{e.get('view_count')}"
-                )
-                print(f"      [{idx:02}] {tit}  ({kind})  | {metric} | score {sc}")
-            if sc > best_score:
-                best_entry, best_score, best_type = e, sc, kind
-        bar.close()
+            # Résultat présent dans les deux recherches : évalué une seule fois
+            eid = e.get("id") or e.get("url")
+            if eid in seen:
+                continue
+            seen.add(eid)
+            entries.append(e)
+    print(f"   • {len(entries)} résultat(s) en {time.time()-t0:.1f}s")
 
-        if best_entry:  # on garde dès qu'on a un candidat scoré
-            break
+    bar = tqdm(total=len(entries), desc="Évaluation", unit="résultat")
+    for idx, e in enumerate(entries, 1):
+        bar.update(1)
+        sc, kind = score_entry(e)
+        if verbose:
+            tit = e.get("title") or "(titre inconnu)"
+            metric = (
+                f"vidéos:{e.get('playlist_count')}"
+                if kind == "playlist"
+                else f"vues:{e.get('view_count')}"
+            )
+            print(f"      [{idx:02}] {tit}  ({kind})  | {metric} | score {sc}")
+        if sc > best_score:
+            best_entry, best_score, best_type = e, sc, kind
+    bar.close()
 
     if not best_entry:
         raise Exception(f"Aucun résultat pertinent pour « {term} ».")
@@ -151,7 +210,16 @@ def search_best(term: str, verbose: bool = False) -> str:
         f"✅  {'📜' if best_type=='playlist' else '🎞️'} Sélection : "
         f"{best_entry.get('title')}  (score {best_score})"
     )
-    return url
+    title = best_entry.get("title") or ""
+    if best_type == "video":
+        return SearchResult(url, [url], False, title)
+    # Playlist : entrées réutilisées si la recherche les a fournies
+    entries = [
+        v if v.startswith("http") else f"https://www.youtube.com/watch?v={v}"
+        for v in (e.get("url") for e in best_entry.get("entries") or () if e)
+        if v
+    ]
+    return SearchResult(url, entries or None, True, title)
 
 
 # ─────────────────────── 2) Extraction vidéos ───────────────────────
@@ -228,23 +296,42 @@ def ydl_options(fmt: str, outdir: str, hook, thumb: bool) -> dict:
 
 
 # ─────────────────────── 4) Téléchargement liste ───────────────────────
-def download_all(vids, fmt, outdir, thumb, verbose=False, ctx=""):
+def download_all(vids, fmt, outdir, thumb, verbose=False, ctx="", jobs=4):
     os.makedirs(outdir, exist_ok=True)
     print(f"\n⏬  {ctx}  → dossier : {outdir}")
     bar = tqdm(total=len(vids), desc="Total", unit="vidéo")
     fails = []
 
-    for v in vids:
-        if verbose:
-            print(f"   → {v}")
-        pb = ProgressBar()
-        try:
-            with YoutubeDL(ydl_options(fmt, outdir, pb.hook, thumb)) as ydl:
-                ydl.download([v])
-        except DownloadError as exc:
-            print(f"[Erreur] {v}\n        ↳ {exc}")
-            fails.append((v, str(exc)))
-        bar.update(1)
+    # Un YoutubeDL par thread (non partageable entre threads), réutilisé pour
+    # toutes les vidéos traitées par ce thread ; chacun a sa ligne de barre.
+    local = threading.local()
+    positions = itertools.count(1)
+    lock = threading.Lock()
+
+    with contextlib.ExitStack() as stack:
+
+        def one(v):
+            if not hasattr(local, "ydl"):
+                local.pb = ProgressBar(position=next(positions))
+                with lock:
+                    local.ydl = stack.enter_context(
+                        YoutubeDL(ydl_options(fmt, outdir, local.pb.hook, thumb))
+                    )
+            if verbose:
+                print(f"   → {v}")
+            try:
+                local.ydl.download([v])
+            except DownloadError as exc:
+                print(f"[Erreur] {v}\n        ↳ {exc}")
+                return v, str(exc)
+            return None
+
+        with ThreadPoolExecutor(max_workers=jobs) as ex:
+            for fut in as_completed([ex.submit(one, v) for v in vids]):
+                err = fut.result()
+                if err:
+                    fails.append(err)
+                bar.update(1)
 
     bar.close()
     if fails:
@@ -255,8 +342,12 @@ def download_all(vids, fmt, outdir, thumb, verbose=False, ctx=""):
 
 # ─────────────────────── 5) Lecture fichier texte ───────────────────────
 def read_file(path: str):
+    """Lignes utiles (ni vides ni commentaires), produites au fil de la lecture."""
     with open(path, encoding="utf-8") as f:
-        return [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
+        for ln in f:
+            s = ln.strip()
+            if s and not s.startswith("#"):
+                yield s
 
 
 # ─────────────────────── 6) Interface CLI ───────────────────────
@@ -274,6 +365,9 @@ Options principaux
   --format mp3|mp4   Format de sortie (défaut mp4)
   --output DIR    Dossier de sortie (défaut : nom playlist ou downloads)
   --thumbnail     Télécharge & intègre la miniature
+  --jobs N        Téléchargements simultanés (défaut 4)
+  --no-cache      Relance les recherches sans lire le cache (~/.cache/yt_dl)
+  --cache-ttl S   Durée de validité du cache en secondes (défaut 7 jours)
   --verbose       Affiche le score de chaque candidat & les URLs vidéo
 """
 
@@ -291,11 +385,16 @@ def main():
     P.add_argument("--format", choices=["mp3", "mp4"], default="mp4")
     P.add_argument("--output")
     P.add_argument("--thumbnail", action="store_true")
+    P.add_argument("--jobs", type=int, default=4)
+    P.add_argument("--no-cache", action="store_true")
+    P.add_argument("--cache-ttl", type=int, default=CACHE_TTL)
     P.add_argument("--verbose", action="store_true")
     P.add_argument("--help", action="store_true")
     args, unknown = P.parse_known_args()
     if args.help or unknown:
         help_exit(0 if args.help else 1)
+    search_best.enabled = not args.no_cache
+    search_best.ttl = args.cache_ttl
 
     # Construit les tâches
     tasks = [("url", u) for u in args.urls]
@@ -315,16 +414,27 @@ def main():
     # Exécute chaque tâche
     for kind, val in tasks:
         try:
-            if kind == "search":
-                val = search_best(val, verbose=args.verbose)
-
-            vids, meta = get_video_list(val, verbose=args.verbose)
+            sr = search_best(val, verbose=args.verbose) if kind == "search" else None
+            if sr and sr.entries:
+                # Liste déjà obtenue par la recherche : pas de second extract_info
+                val = sr.url
+                vids = sr.entries
+                meta = {"is_playlist": sr.is_playlist, "title": sr.title}
+            else:
+                val = sr.url if sr else val
+                vids, meta = get_video_list(val, verbose=args.verbose)
             outdir = args.output or (
                 sanitize(meta["title"]) if meta["is_playlist"] else "downloads"
             )
             ctx = meta["title"] or val
             download_all(
-                vids, args.format, outdir, args.thumbnail, verbose=args.verbose, ctx=ctx
+                vids,
+                args.format,
+                outdir,
+                args.thumbnail,
+                verbose=args.verbose,
+                ctx=ctx,
+                jobs=args.jobs,
             )
         except Exception as exc:
             print(f"[Erreur {kind}] {val}\n        ↳ {exc}")
@@ -7,25 +7,119 @@
 #  • Malus “review” ou “cover” : –100 pts si ces mots sont dans le titre
 #  • --verbose : affiche titre, métrique, score et URL de chaque candidat
 #  • Options : fichier d’entrées, miniatures, dossier auto, barres de progression
+#  • Facultatif : pip install orjson  (lecture/écriture du cache plus rapide)
 
-import argparse, os, re, sys, time, threading, queue
+import argparse, hashlib, itertools, json, multiprocessing, os, re, shutil, sys, time
+import threading
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from yt_dlp import YoutubeDL, DownloadError
 from tqdm import tqdm
 
+try:  # orjson facultatif : même format, (dé)sérialisation plus rapide
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
 # ───────── utilitaires
-INVALID_FS = r'[\\/*?:"<>|]'
+INVALID_FS = '\\/*?:"<>|'  # caractères interdits dans un nom de fichier
+_FS_TRANS = str.maketrans(dict.fromkeys(INVALID_FS, "_"))
+_WATCH = "https://www.youtube.com/watch?v="
+_PLIST = "https://www.youtube.com/playlist?list="
 
 
 def sanitize(name: str) -> str:
-    return (re.sub(INVALID_FS, "_", name).strip().rstrip("."))[:100] or "output"
+    return (name.translate(_FS_TRANS).strip().rstrip("."))[:100] or "output"
+
+
+# ───────── instances YoutubeDL réutilisées
+_ydl_tls = threading.local()
+
+
+def _ydl(opts):
+    """Un YoutubeDL par thread et par jeu d'options (instance non thread-safe)."""
+    by_opts = _ydl_tls.__dict__.setdefault("by_opts", {})
+    key = repr(sorted(opts.items()))
+    if key not in by_opts:
+        by_opts[key] = YoutubeDL(opts)
+    return by_opts[key]
+
+
+# ───────── cache disque des extractions
+CACHE_DIR = os.path.expanduser("~/.cache/yt_downloader")
+CACHE_TTL = 3600  # 1 h
+# cache propre à yt-dlp (fonctions de signature du lecteur) conservé entre exécutions
+YTDLP_CACHE = os.path.join(CACHE_DIR, "ytdlp")
+
+
+def _extract(query, opts):
+    # peut tourner dans un processus fils (--procs) : arguments et retour picklables
+    ydl = _ydl(opts)
+    info = ydl.extract_info(query, download=False)
+    return info and ydl.sanitize_info(info)  # dict JSON-sérialisable
+
+
+def _cached_extract(query, opts, ttl=None, pool=None):
+    """extract_info mis en cache (JSON) ; clé = requête + options yt-dlp."""
+    ttl = _cached_extract.ttl if ttl is None else ttl
+    raw = repr((query, sorted(opts.items()))).encode("utf-8")
+    path = os.path.join(CACHE_DIR, hashlib.blake2b(raw, digest_size=16).hexdigest())
+    if _cached_extract.enabled:
+        try:
+            if time.time() - os.path.getmtime(path) < ttl:
+                with open(path, "rb") as f:
+                    return _json_loads(f.read())
+        except (OSError, ValueError):
+            pass
+    if pool is not None:
+        info = pool.submit(_extract, query, opts).result()
+    else:
+        info = _extract(query, opts)
+    if info:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(_json_dumps(info))
+            os.replace(tmp, path)  # écriture atomique
+        except OSError as e:
+            print(f"Cache non écrit : {e}")
+    return info
+
+
+_cached_extract.enabled = True
+_cached_extract.ttl = CACHE_TTL
 
 
 # ───────── barre par vidéo
 class ProgressBar:
-    def __init__(self):
+    def __init__(self, position=None):
         self.bar = None
+        self.vid = None
+        self.position = position  # ligne tqdm dédiée (téléchargements parallèles)
 
     def hook(self, d):
+        # barre partagée par les vidéos d'un thread : nouvelle vidéo, nouvelle barre
+        vid = (d.get("info_dict") or {}).get("id")
+        if vid != self.vid:
+            self.vid = vid
+            if self.bar:
+                self.bar.close()
+                self.bar = None
         if d["status"] == "downloading":
             tot = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
             done = d.get("downloaded_bytes", 0)
@@ -35,10 +129,16 @@ class ProgressBar:
                     unit="B",
                     unit_scale=True,
                     desc=d.get("filename", "Téléchargement"),
+                    position=self.position,
+                    leave=self.position is None,
+                    # ~5 rafraîchissements/s au plus : le hook est appelé très souvent
+                    mininterval=0.2,
+                    maxinterval=1.0,
+                    miniters=tot // 200 or 1,
                 )
             if self.bar:
-                self.bar.n = done
-                self.bar.refresh()
+                # update() ne redessine que si l'intervalle est écoulé
+                self.bar.update(done - self.bar.n)
         elif d["status"] == "finished" and self.bar:
             self.bar.n = self.bar.total
             self.bar.close()
@@ -46,15 +146,28 @@ class ProgressBar:
 
 
 # ───────── 1) Recherche
-def score_entry(e: dict, big_bonus=False) -> tuple[int, str]:
-    title = (e.get("title") or "").lower()
+# mots-clés du titre repérés en un seul passage
+_SCORE_RE = re.compile(r"full album|official|review|cover|live")
+
+
+def title_hits(e: dict) -> set:
+    raw = e.get("title")
+    return set(_SCORE_RE.findall(raw.lower())) if raw else set()
+
+
+def score_entry(e: dict, big_bonus=False, hits=None) -> tuple[int, str]:
+    # vidéo sans compteur de vues (entrée plate incomplète) : score nul d'office
+    if e.get("_type") != "playlist" and not e.get("view_count"):
+        return 0, "video"
+    if hits is None:
+        hits = title_hits(e)
     bonus_full = (
         400
-        if big_bonus and "full album" in title
-        else 100 if "full album" in title else 0
+        if big_bonus and "full album" in hits
+        else 100 if "full album" in hits else 0
     )
-    bonus_off = 50 if "official" in title else 0
-    malus = -100 if any(w in title for w in ("review", "cover")) else 0
+    bonus_off = 50 if "official" in hits else 0
+    malus = -100 if hits & {"review", "cover"} else 0
     if e.get("_type") == "playlist":
         return (
             e.get("playlist_count") or 0
@@ -63,7 +176,7 @@ def score_entry(e: dict, big_bonus=False) -> tuple[int, str]:
     return views + bonus_full + bonus_off + malus, "video"
 
 
-def _search_worker(q: queue.Queue, query: str):
+def _search_worker(query: str):
     opts = {
         "quiet": True,
         "extract_flat": True,
@@ -71,12 +184,25 @@ def _search_worker(q: queue.Queue, query: str):
         "ignoreerrors": True,
         "forcejson": True,
         "socket_timeout": 10,
+        "extractor_retries": 2,
+        "cachedir": YTDLP_CACHE,
+        # métadonnées seules : pas de configuration du lecteur à charger
+        "extractor_args": {"youtube": {"player_skip": ["configs"]}},
     }
     try:
-        with YoutubeDL(opts) as ydl:
-            q.put(("ok", ydl.extract_info(query, download=False)))
+        return query, _cached_extract(query, opts, pool=_search_worker.procs)
     except Exception as e:
-        q.put(("err", e))
+        return query, e
+
+
+_search_worker.procs = None  # ProcessPoolExecutor si --procs
+
+
+# playlist à ce score : choix évident, inutile d'évaluer la suite
+_CONFIDENT = 500
+
+# threads durables : leurs YoutubeDL sont réutilisés d'une recherche à l'autre
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=2)
 
 
 def search_best(term, verbose=False):
@@ -88,62 +214,63 @@ def search_best(term, verbose=False):
         else [f"ytsearch20:{term}", f"ytsearch20:{term} full album"]
     )
     best, best_score, best_kind = None, -1, ""
-    for qi, qstr in enumerate(queries, 1):
-        print(f"🔍  ({qi}/{len(queries)}) Recherche : {qstr}")
-        q = queue.Queue()
-        t0 = time.time()
-        th = threading.Thread(target=_search_worker, args=(q, qstr), daemon=True)
-        th.start()
-        spin = tqdm(total=0, bar_format="{desc}")
-        frames = "|/-\\"
-        k = 0
-        while th.is_alive():
-            spin.set_description(f"Recherche YouTube {frames[k%4]}")
-            k += 1
-            time.sleep(0.2)
-        spin.close()
-        status, data = q.get()
-        if status == "err":
-            print(f"   ⚠️  Erreur : {data}")
+    for qstr in queries:
+        print(f"🔍  Recherche : {qstr}")
+    t0 = time.time()
+    # requêtes indépendantes : lancées ensemble, attente = la plus lente
+    futures = [_SEARCH_POOL.submit(_search_worker, qstr) for qstr in queries]
+    # chrono rafraîchi 2×/s ; wait() rend la main dès que tout est terminé
+    spin = tqdm(total=0, bar_format="{desc} {elapsed}", desc="Recherche YouTube")
+    while wait(futures, timeout=0.5).not_done:
+        spin.refresh()
+    spin.close()
+    # tous les candidats dans un seul lot : le meilleur global l'emporte
+    entries = []
+    for fut in futures:  # ordre des requêtes : départage stable à score égal
+        qstr, data = fut.result()
+        if isinstance(data, Exception):
+            print(f"   ⚠️  Erreur ({qstr}) : {data}")
             continue
-        entries = data.get("entries") or []
-        print(f"   • {len(entries)} résultat(s) en {time.time()-t0:.1f}s")
-        bar = tqdm(total=len(entries), desc="Évaluation", unit="rés")
-        for idx, e in enumerate(entries, 1):
-            bar.update(1)
-            if not e:
-                continue
-            title = (e.get("title") or "").lower()
-            if not want_live and "live" in title:
-                continue
-            sc, kind = score_entry(e, big_bonus)
-            if verbose:
-                url = e["url"]
-                if kind == "playlist" and not url.startswith("http"):
-                    url = f"https://www.youtube.com/playlist?list={url}"
-                elif kind == "video" and not url.startswith("http"):
-                    url = f"https://www.youtube.com/watch?v={url}"
-                metric = (
-                    f"vidéos:{e.get('playlist_count')}"
-                    if kind == "playlist"
-                    else f"vues:{e.get('view_count')}"
-                )
-                print(
-                    f"      [{idx:02}] {e.get('title')} ({kind}) | {metric} "
-                    f"| score {sc} | {url}"
-                )
-            if sc > best_score:
-                best, best_score, best_kind = e, sc, kind
-        bar.close()
-        if best:
-            break
+        entries += (data or {}).get("entries") or []
+    print(f"   • {len(entries)} résultat(s) en {time.time()-t0:.1f}s")
+    # filtrage en lot (entrées vides, « live » non demandé) avant l'évaluation
+    cands = []
+    for e in filter(None, entries):
+        hits = title_hits(e)
+        if want_live or "live" not in hits:
+            cands.append((e, hits))
+    bar = tqdm(total=len(cands), desc="Évaluation", unit="rés")
+    for idx, (e, hits) in enumerate(cands, 1):
+        bar.update(1)
+        sc, kind = score_entry(e, big_bonus, hits)
+        if verbose:
+            url = e["url"]
+            if kind == "playlist" and not url.startswith("http"):
+                url = _PLIST + url
+            elif kind == "video" and not url.startswith("http"):
+                url = _WATCH + url
+            metric = (
+                f"vidéos:{e.get('playlist_count')}"
+                if kind == "playlist"
+                else f"vues:{e.get('view_count')}"
+            )
+            print(
+                f"      [{idx:02}] {e.get('title')} ({kind}) | {metric} "
+                f"| score {sc} | {url}"
+            )
+        if sc > best_score:
+            best, best_score, best_kind = e, sc, kind
+            if best_kind == "playlist" and best_score >= _CONFIDENT:
+                bar.update(len(cands) - idx)  # barre menée à son terme
+                break
+    bar.close()
     if not best:
         raise Exception(f"Aucun résultat pertinent pour « {term} ».")
     url = best["url"]
     if best_kind == "playlist" and not url.startswith("http"):
-        url = f"https://www.youtube.com/playlist?list={url}"
+        url = _PLIST + url
     elif best_kind == "video" and not url.startswith("http"):
-        url = f"https://www.youtube.com/watch?v={url}"
+        url = _WATCH + url
     print(
         f"✅  {'📜' if best_kind=='playlist' else '🎞️'} Sélection : "
         f"{best.get('title')}  (score {best_score})"
@@ -155,26 +282,30 @@ def search_best(term, verbose=False):
 def get_video_list(link, verbose=False):
     opts = {
         "quiet": True,
-        "extract_flat": "in_playlist",
+        "extract_flat": True,  # métadonnées vidéo différées au téléchargement
         "skip_download": True,
         "ignoreerrors": True,
-        "forcejson": True,
         "socket_timeout": 10,
+        "extractor_retries": 2,
+        "cachedir": YTDLP_CACHE,
+        "extractor_args": {
+            "youtube": {"skip": ["dash", "hls"], "player_skip": ["configs"]}
+        },
     }
-    with YoutubeDL(opts) as ydl:
-        info = ydl.extract_info(link, download=False)
+    info = _cached_extract(link, opts)
     pl = info.get("_type") == "playlist"
     title = info.get("title") or ""
-    urls = []
     if pl:
-        for e in info.get("entries", []):
-            if e and e.get("url"):
-                u = e["url"]
-                urls.append(
-                    u
-                    if u.startswith("http")
-                    else f"https://www.youtube.com/watch?v={u}"
-                )
+        entries = [e for e in info.get("entries") or () if e]
+        first = entries[0] if entries else {}
+        # entrées homogènes (même extracteur) : format choisi une fois pour la liste
+        if first.get("ie_key") == "Youtube" and first.get("id"):
+            # URL reconstruite depuis l'ID : indépendante du format de e["url"]
+            urls = [_WATCH + e["id"] for e in entries if e.get("id")]
+        elif (first.get("url") or "").startswith("http"):
+            urls = [e["url"] for e in entries if e.get("url")]
+        else:
+            urls = [_WATCH + e["url"] for e in entries if e.get("url")]
     else:
         urls = [link]
     if verbose:
@@ -188,9 +319,16 @@ def get_video_list(link, verbose=False):
 def ydl_options(fmt, outdir, hook, thumb):
     o = {
         "outtmpl": os.path.join(outdir, "%((title)s).%(ext)s"),
+        # IDs déjà téléchargés dans ce dossier : ignorés sans requête réseau
+        "download_archive": os.path.join(outdir, ".archive.txt"),
         "progress_hooks": [hook],
         "quiet": True,
         "socket_timeout": 10,
+        "extractor_retries": 2,
+        "cachedir": YTDLP_CACHE,
+        # fragments DASH/HLS récupérés en parallèle, segment bloqué relancé
+        "concurrent_fragment_downloads": 4,
+        "throttledratelimit": 100_000,
     }
     if fmt == "mp3":
         o.update(
@@ -215,22 +353,48 @@ def ydl_options(fmt, outdir, hook, thumb):
 
 
 # ───────── 4) Téléchargement
-def download_all(vids, fmt, outdir, thumb, verbose=False, ctx=""):
+_tls = threading.local()
+
+
+def _init_worker(slots, base_opts, opened):
+    # un YoutubeDL (et une ligne de barre) par thread, réutilisé pour ses vidéos
+    pb = ProgressBar(position=next(slots))
+    _tls.ydl = YoutubeDL({**base_opts, "progress_hooks": [pb.hook]})
+    opened.append(_tls.ydl)
+
+
+def _dl_one(v, verbose=False):
+    if verbose:
+        print(f"   → {v}")
+    try:
+        _tls.ydl.download([v])
+    except DownloadError as exc:
+        print(f"[Erreur] {v}\n        ↳ {exc}")
+        return v, str(exc)
+    return None
+
+
+def download_all(vids, fmt, outdir, thumb, verbose=False, ctx="", jobs=4):
     os.makedirs(outdir, exist_ok=True)
     print(f"\n⏬  {ctx}  → dossier : {outdir}")
     bar = tqdm(total=len(vids), desc="Total", unit="vidéo")
-    fails = []
-    for v in vids:
-        if verbose:
-            print(f"   → {v}")
-        pb = ProgressBar()
-        try:
-            with YoutubeDL(ydl_options(fmt, outdir, pb.hook, thumb)) as ydl:
-                ydl.download([v])
-        except DownloadError as exc:
-            print(f"[Erreur] {v}\n        ↳ {exc}")
-            fails.append((v, str(exc)))
-        bar.update(1)
+    fails, opened = [], []
+    # options calculées une fois par liste ; seul le hook diffère entre threads
+    base_opts = ydl_options(fmt, outdir, None, thumb)
+    with ThreadPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(itertools.count(1), base_opts, opened),
+    ) as ex:
+        futures = {ex.submit(_dl_one, v, verbose): v for v in vids}
+        # résultats traités dans ce thread : ni verrou ni course sur fails / bar
+        for fut in as_completed(futures):
+            err = fut.result()
+            if err:
+                fails.append(err)
+            bar.update(1)
+    for ydl in opened:
+        ydl.close()
     bar.close()
     if fails:
         print(f"⚠️  {len(fails)} vidéo(s) en échec :")
@@ -240,8 +404,9 @@ def download_all(vids, fmt, outdir, thumb, verbose=False, ctx=""):
 
 # ───────── 5) Lecture fichier
 def read_file(path):
+    # générateur : lignes filtrées à la demande, fichier fermé en fin de lecture
     with open(path, encoding="utf-8") as f:
-        return [l.strip() for l in f if l.strip() and not l.startswith("#")]
+        yield from (l for l in map(str.strip, f) if l and not l.startswith("#"))
 
 
 # ───────── 6) CLI
@@ -253,26 +418,43 @@ def main():
     p.add_argument("--format", choices=["mp3", "mp4"], default="mp4")
     p.add_argument("--output")
     p.add_argument("--thumbnail", action="store_true")
+    p.add_argument("--jobs", type=int, default=4)
+    p.add_argument("--no-cache", action="store_true")
+    p.add_argument("--cache-ttl", type=int, default=CACHE_TTL)
+    p.add_argument("--clear-cache", action="store_true")
+    p.add_argument("--procs", action="store_true")
     p.add_argument("--verbose", action="store_true")
     p.add_argument("--help", action="store_true")
     args, unk = p.parse_known_args()
     if args.help or unk:
         print("python youtube_downloader.py [URL …] --search terme … [options]")
         sys.exit(0 if args.help else 1)
+    if args.clear_cache:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        print(f"🧹  Cache vidé : {CACHE_DIR}")
+    _cached_extract.enabled = not args.no_cache
+    _cached_extract.ttl = args.cache_ttl
+    if args.procs:
+        # gros lots : analyse des réponses hors du GIL du processus principal
+        _search_worker.procs = ProcessPoolExecutor(
+            max_workers=2, mp_context=multiprocessing.get_context("spawn")
+        )
 
     tasks = [("url", u) for u in args.urls] + [
         ("search", q) for q in (args.search or [])
     ]
     if args.file:
         try:
-            tasks += [
+            tasks.extend(
                 ("url" if l.startswith("http") else "search", l)
                 for l in read_file(args.file)
-            ]
+            )
         except OSError as e:
             print(f"[Erreur] Lecture fichier : {e}")
             sys.exit(1)
     if not tasks:
+        if args.clear_cache:  # --clear-cache seul : rien d'autre à faire
+            return
         print("Aucune tâche fournie.")
         sys.exit(1)
 
@@ -285,7 +467,15 @@ def main():
                 sanitize(meta["title"]) if meta["is_playlist"] else "downloads"
             )
             ctx = meta["title"] or val
-            download_all(vids, args.format, outdir, args.thumbnail, args.verbose, ctx)
+            download_all(
+                vids,
+                args.format,
+                outdir,
+                args.thumbnail,
+                args.verbose,
+                ctx,
+                jobs=max(1, args.jobs),
+            )
         except Exception as exc:
             print(f"[Erreur {kind}] {val}\n        ↳ {exc}")
 
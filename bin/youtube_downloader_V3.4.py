@@ -6,80 +6,193 @@ Télécharge vidéos ou playlists YouTube en MP3 / MP4 **avec métadonnées comp
 Nouveautés (v14.9)
 ------------------
 • Les MP3 contiennent désormais les tags ID3 : `title`, `artist`, `album`,
-  `track`, `date`, ainsi que la miniature (si disponible) grâce aux
-  post‐processeurs **FFmpegExtractAudio ➜ FFmpegMetadata ➜ EmbedThumbnail**.
+  `track`, `date`, ainsi que la miniature (si disponible) : conversion MP3,
+  tags et pochette sont faits en **une seule passe ffmpeg** (`Mp3OnePassPP`).
 • Score amélioré : bonus pour titres « artiste - titre (année) ».
 • Filtre Live, bonus Full-Album, malus Review/Cover, vues pondérées (1 pt / 100 000).
 • Affichage `--verbose` trié par score (durée, URL, score).
 • Gestion playlists / vidéos uniques, dossier auto, fichier d’entrées, etc.
 
 Dépendances : `yt-dlp`, `ffmpeg`, `tqdm`
+(`pip install "yt-dlp[default]"` ajoute `requests` : connexions HTTP persistantes)
 """
 
 import argparse
+import asyncio
+import atexit
 import datetime
+import functools
+import heapq
+import itertools
+import multiprocessing
 import os
-import queue
+import pickle
 import re
+import socket
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Tuple
 
 from yt_dlp import YoutubeDL, DownloadError
+from yt_dlp.postprocessor import FFmpegPostProcessor
 from tqdm import tqdm
 
 
 # ────────────────────────── utilitaires ──────────────────────────
 INVALID_FS = r'[\\/*?:"<>|]'
+_INVALID_FS_RE = re.compile(INVALID_FS)
 
 
 def sanitize(name: str) -> str:
-    return (re.sub(INVALID_FS, "_", name).strip().rstrip("."))[:100] or "output"
+    return (_INVALID_FS_RE.sub("_", name).strip().rstrip("."))[:100] or "output"
+
+
+_HTTP = ("http://", "https://")
 
 
 def sec_to_hms(sec: int | None) -> str:
     return "?" if not sec else str(datetime.timedelta(seconds=sec))
 
 
+# Extracteurs YouTube seuls : l'URL n'est testée que contre eux et les autres
+# classes ne sont jamais chargées (yt-dlp installé avec ses lazy extractors,
+# cas des wheels PyPI)
+YT_EXTRACTORS = ["youtube", "youtube:.*"]
+
+# YoutubeDL par thread et par jeu d'options (non thread-safe), réutilisé d'un
+# appel à l'autre : ses connexions HTTP restent ouvertes entre deux requêtes
+_ydl_tls = threading.local()
+
+
+def _thread_ydl(opts: dict) -> YoutubeDL:
+    by_opts = _ydl_tls.__dict__.setdefault("by_opts", {})
+    ydl = by_opts.get(id(opts))  # clé : l'identité du jeu d'options du module
+    if ydl is None:
+        # copie : yt-dlp écrit dans le dict de params qu'on lui passe
+        ydl = by_opts[id(opts)] = YoutubeDL(dict(opts))
+    return ydl
+
+
+# ────────────────────────── cache DNS ──────────────────────────
+# yt-dlp résout les mêmes hôtes à chaque connexion : réponses gardées 5 min
+DNS_TTL = 300
+_getaddrinfo = socket.getaddrinfo
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_getaddrinfo(epoch: int, *args, **kwargs):
+    return _getaddrinfo(*args, **kwargs)
+
+
+def _getaddrinfo_ttl(*args, **kwargs):
+    # 'epoch' change toutes les DNS_TTL secondes : les anciennes entrées expirent
+    return _cached_getaddrinfo(int(time.monotonic() // DNS_TTL), *args, **kwargs)
+
+
+socket.getaddrinfo = _getaddrinfo_ttl
+
+
 # ───────────────────────── barre individuelle ─────────────────────────
+# Lignes tqdm attribuées pour tout le processus : plusieurs listes (--jobs)
+# téléchargent en même temps sans dessiner leurs barres les unes sur les autres
+_slot_lock = threading.Lock()
+_free_slots: List[int] = []  # tas : la plus basse ligne libre d'abord
+_next_slot = itertools.count()
+# processus de --procs : seule la barre « Tâches » du parent est dessinée, les
+# lignes allouées ici ne sont pas coordonnées avec celles des autres processus
+_bars_off = False
+
+
+def acquire_slot() -> int:
+    with _slot_lock:
+        return heapq.heappop(_free_slots) if _free_slots else next(_next_slot)
+
+
+def release_slot(slot: int):
+    with _slot_lock:
+        heapq.heappush(_free_slots, slot)
+
+
 class ProgressBar:
-    def __init__(self):
+    REFRESH = 0.1  # secondes entre deux mises à jour (~10 Hz)
+
+    def __init__(self, position=None):
         self.bar = None
+        self.position = position  # ligne tqdm dédiée (téléchargements parallèles)
+        self._last_t = 0.0
+        self._last_n = 0
+
+    def reset(self):
+        # barre restée ouverte par un téléchargement interrompu
+        if self.bar:
+            self.bar.close()
+            self.bar = None
+        self._last_n = 0
 
     def hook(self, d):
         if d["status"] == "downloading":
             tot = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
             done = d.get("downloaded_bytes", 0)
-            if not self.bar and tot:
+            if not self.bar:
+                if not tot:
+                    return
                 self.bar = tqdm(
                     total=tot,
                     unit="B",
                     unit_scale=True,
                     desc=d.get("filename", "Téléchargement"),
+                    position=self.position,
+                    leave=self.position is None,
+                    disable=_bars_off,
                 )
-            if self.bar:
-                self.bar.n = done
-                self.bar.refresh()
+            # hook appelé des dizaines de fois par seconde : on n'en garde qu'une partie
+            now = time.monotonic()
+            if now - self._last_t < self.REFRESH and done != tot:
+                return
+            self.bar.update(done - self._last_n)
+            self._last_n = done
+            self._last_t = now
         elif d["status"] == "finished" and self.bar:
             self.bar.n = self.bar.total
             self.bar.close()
             self.bar = None
+            self._last_n = 0
 
 
 # ───────────────────────── 1) Recherche & scoring ─────────────────────────
-def score_entry(entry: dict, boost_full: bool) -> Tuple[int, str]:
-    """Retourne (score, kind) ; kind ∈ {'playlist','video'}."""
-    title = (entry.get("title") or "").lower()
-
-    bonus_struct = 300 if re.search(r".+ - .+\(\d{4}\)", title) else 0
+_STRUCT_RE = re.compile(r".+ - .+\(\d{4}\)")  # « artiste - titre (année) »
+MALUS_WORDS = frozenset(("review", "cover"))
+# mots-clés du titre repérés en un seul passage
+_KW_RE = re.compile(r"full album|official|review|cover")
+
+
+def score_entry(
+    entry: dict, boost_full: bool, title: str | None = None
+) -> Tuple[int, str]:
+    """
+    Retourne (score, kind) ; kind ∈ {'playlist','video'}.
+    'title' : titre déjà mis en minuscules par l'appelant, s'il l'a calculé.
+    """
+    if title is None:
+        raw = entry.get("title")
+        title = raw.lower() if raw else ""
+    if not title:
+        # entrée plate incomplète : classée en dernier, sans autre calcul
+        return -(10**9), "playlist" if entry.get("_type") == "playlist" else "video"
+
+    flags = set(_KW_RE.findall(title))
+
+    # " - " absent : inutile de lancer la regex (coûteuse en retours arrière)
+    bonus_struct = 300 if " - " in title and _STRUCT_RE.search(title) else 0
     bonus_full = (
         400
-        if boost_full and "full album" in title
-        else 100 if "full album" in title else 0
+        if boost_full and "full album" in flags
+        else 100 if "full album" in flags else 0
     )
-    bonus_off = 50 if "official" in title else 0
-    malus = -100 if any(w in title for w in ("review", "cover")) else 0
+    bonus_off = 50 if "official" in flags else 0
+    malus = -100 if flags & MALUS_WORDS else 0
 
     if entry.get("_type") == "playlist":
         score = (
@@ -97,67 +210,95 @@ def score_entry(entry: dict, boost_full: bool) -> Tuple[int, str]:
     return score, "video"
 
 
-def _search_worker(q: queue.Queue, query: str):
-    opts = {
-        "quiet": True,
-        "extract_flat": True,
-        "skip_download": True,
-        "ignoreerrors": True,
-        "forcejson": True,
-        "socket_timeout": 10,
-    }
+SEARCH_OPTS = {
+    "quiet": True,
+    "extract_flat": True,
+    "skip_download": True,
+    "ignoreerrors": True,
+    "socket_timeout": 10,
+    "allowed_extractors": YT_EXTRACTORS,
+}
+
+
+def _search_worker(qi: int, query: str):
     try:
-        with YoutubeDL(opts) as ydl:
-            q.put(("ok", ydl.extract_info(query, download=False)))
+        ydl = _thread_ydl(SEARCH_OPTS)
+        return qi, "ok", ydl.extract_info(query, download=False)
     except Exception as exc:
-        q.put(("err", exc))
+        return qi, "err", exc
 
 
-def search_best(term: str, verbose: bool = False) -> str:
-    want_live = "live" in term.lower()
-    boost_full = "full album" in term.lower()
+def _rank(c: dict) -> tuple:
+    """Clé de classement : meilleur score d'abord, puis ordre d'arrivée."""
+    return -c["score"], c["idx"]
+
+
+async def search_best(term: str, verbose: bool = False) -> str:
+    term_l = term.lower()
+    want_live = "live" in term_l
+    boost_full = "full album" in term_l
     queries = (
         [f"ytsearch20:{term}"]
         if boost_full
         else [f"ytsearch20:{term}", f"ytsearch20:{term} full album"]
     )
 
-    best_entry, best_score, best_kind = None, -1, ""
+    # requêtes lancées ensemble : attente = la plus lente, pas leur somme
+    t0 = time.time()
     for qi, qstr in enumerate(queries, 1):
         print(f"🔍  ({qi}/{len(queries)}) Recherche : {qstr}")
-        q = queue.Queue()
-        t0 = time.time()
-        threading.Thread(target=_search_worker, args=(q, qstr), daemon=True).start()
-
-        spin = tqdm(total=0, bar_format="{desc}")
-        frames = "|/-\\"
-        k = 0
-        while spin.total == 0 or not q.qsize():
+    pending = {
+        asyncio.create_task(asyncio.to_thread(_search_worker, qi, qstr))
+        for qi, qstr in enumerate(queries, 1)
+    }
+
+    # ligne réservée : pas de chevauchement avec les barres d'autres listes (--jobs)
+    spin_slot = acquire_slot()
+    spin = tqdm(
+        total=0,
+        bar_format="{desc}",
+        position=spin_slot,
+        leave=False,
+        disable=_bars_off,
+    )
+    frames = "|/-\\"
+    k = 0
+    replies = []
+    # réveil dès qu'une réponse arrive, spinner redessiné toutes les 0,2 s sinon
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, timeout=0.2, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not done:
             spin.set_description(f"Recherche YouTube {frames[k%4]}")
             k += 1
-            time.sleep(0.2)
-        spin.close()
-
-        status, data = q.get()
-        if status == "err":
-            print(f"   ⚠️  Erreur : {data}")
-            continue
-        entries = data.get("entries") or []
-        print(f"   • {len(entries)} résultat(s) en {time.time()-t0:.1f}s")
-
-        cands = []
+        for task in done:
+            qi, status, data = task.result()
+            if status == "err":
+                spin.write(f"   ⚠️  ({qi}) Erreur : {data}")
+                continue
+            entries = data.get("entries") or []
+            dt = time.time() - t0
+            spin.write(f"   • ({qi}) {len(entries)} résultat(s) en {dt:.1f}s")
+            replies.append((qi, entries))
+    spin.close()
+    release_slot(spin_slot)
+
+    cands = []
+    for qi, entries in replies:
         for idx, e in enumerate(entries, 1):
             if not e:
                 continue
             ttl = (e.get("title") or "").lower()
             if not want_live and "live" in ttl:
                 continue
-            score, kind = score_entry(e, boost_full)
+            score, kind = score_entry(e, boost_full, ttl)
             url = e["url"]
-            if kind == "playlist" and not url.startswith("http"):
-                url = f"https://www.youtube.com/playlist?list={url}"
-            elif kind == "video" and not url.startswith("http"):
-                url = f"https://www.youtube.com/watch?v={url}"
+            if not url.startswith(_HTTP):
+                if kind == "playlist":
+                    url = f"https://www.youtube.com/playlist?list={url}"
+                else:
+                    url = f"https://www.youtube.com/watch?v={url}"
             metric = (
                 f"vidéos:{e.get('playlist_count')}"
                 if kind == "playlist"
@@ -166,7 +307,7 @@ def search_best(term: str, verbose: bool = False) -> str:
             dur = sec_to_hms(e.get("duration")) if kind == "video" else "—"
             cands.append(
                 {
-                    "idx": idx,
+                    "idx": (qi, idx),
                     "entry": e,
                     "score": score,
                     "kind": kind,
@@ -175,32 +316,30 @@ def search_best(term: str, verbose: bool = False) -> str:
                     "dur": dur,
                 }
             )
-        cands.sort(key=lambda c: (-c["score"], c["idx"]))
-
-        if verbose:
-            print("Résultats triés :")
-            for c in cands:
-                print(
-                    f"  [{c['idx']:02}] {c['entry'].get('title')} ({c['kind']}) | "
-                    f"{c['metric']} | dur:{c['dur']} | score {c['score']} | {c['url']}"
-                )
-
-        if cands:
-            best_entry, best_score, best_kind = (
-                cands[0]["entry"],
-                cands[0]["score"],
-                cands[0]["kind"],
-            )
-            break
-
-    if not best_entry:
+    if not cands:
         raise Exception(f"Aucun résultat pertinent pour « {term} ».")
 
-    fin_url = best_entry["url"]
-    if best_kind == "playlist" and not fin_url.startswith("http"):
-        fin_url = f"https://www.youtube.com/playlist?list={fin_url}"
-    elif best_kind == "video" and not fin_url.startswith("http"):
-        fin_url = f"https://www.youtube.com/watch?v={fin_url}"
+    # candidats des deux requêtes classés ensemble ; à score égal, ordre des requêtes
+    if verbose:
+        cands.sort(key=_rank)
+        print("Résultats triés :")
+        for c in cands:
+            qi, idx = c["idx"]
+            print(
+                f"  [{qi}.{idx:02}] {c['entry'].get('title')} ({c['kind']}) | "
+                f"{c['metric']} | dur:{c['dur']} | score {c['score']} | {c['url']}"
+            )
+        best = cands[0]
+    else:
+        best = min(cands, key=_rank)  # seul le premier sert : pas de tri complet
+
+    # URL complète déjà calculée pour chaque candidat
+    best_entry, best_score, best_kind, fin_url = (
+        best["entry"],
+        best["score"],
+        best["kind"],
+        best["url"],
+    )
 
     print(
         f"✅  {'📜' if best_kind=='playlist' else '🎞️'} Sélection : "
@@ -210,17 +349,59 @@ def search_best(term: str, verbose: bool = False) -> str:
 
 
 # ───────────────────────── 2) Extraction infos ─────────────────────────
+# URL → (horodatage, (urls, is_pl, title)) ; gardé sur disque entre deux lancements
+LIST_CACHE = os.path.expanduser("~/.cache/yt_downloader/playlists.pkl")
+LIST_TTL = 3600  # 1 h
+_list_cache: dict = {}
+_list_lock = threading.Lock()
+
+
+def load_list_cache():
+    try:
+        with open(LIST_CACHE, "rb") as f:
+            _list_cache.update(pickle.load(f))
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+
+def save_list_cache():
+    now = time.time()
+    with _list_lock:
+        fresh = {u: v for u, v in _list_cache.items() if now - v[0] < LIST_TTL}
+    try:
+        os.makedirs(os.path.dirname(LIST_CACHE), exist_ok=True)
+        tmp = f"{LIST_CACHE}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(fresh, f)
+        os.replace(tmp, LIST_CACHE)
+    except OSError as e:
+        print(f"Cache non écrit : {e}")
+
+
 def get_video_list(url: str):
-    opts = {
-        "quiet": True,
-        "extract_flat": "in_playlist",
-        "skip_download": True,
-        "ignoreerrors": True,
-        "forcejson": True,
-        "socket_timeout": 10,
-    }
-    with YoutubeDL(opts) as ydl:
-        info = ydl.extract_info(url, download=False)
+    # horloge murale (et non monotonic) : le cache survit au redémarrage
+    with _list_lock:
+        hit = _list_cache.get(url)
+    if hit and time.time() - hit[0] < LIST_TTL:
+        return hit[1]
+    res = _fetch_video_list(url)
+    with _list_lock:
+        _list_cache[url] = (time.time(), res)
+    return res
+
+
+LIST_OPTS = {
+    "quiet": True,
+    "extract_flat": "in_playlist",
+    "skip_download": True,
+    "ignoreerrors": True,
+    "socket_timeout": 10,
+    "allowed_extractors": YT_EXTRACTORS,
+}
+
+
+def _fetch_video_list(url: str):
+    info = _thread_ydl(LIST_OPTS).extract_info(url, download=False)
     if info.get("_type") == "playlist":
         urls = []
         for e in info.get("entries", []):
@@ -229,7 +410,7 @@ def get_video_list(url: str):
             vid = e["url"]
             urls.append(
                 vid
-                if vid.startswith("http")
+                if vid.startswith(_HTTP)
                 else f"https://www.youtube.com/watch?v={vid}"
             )
         title = info.get("title") or "playlist"
@@ -239,6 +420,60 @@ def get_video_list(url: str):
 
 
 # ───────────────────────── 3) Options yt-dlp ─────────────────────────
+class Mp3OnePassPP(FFmpegPostProcessor):
+    """
+    MP3 + tags ID3 + miniature en un seul appel à ffmpeg, au lieu de la chaîne
+    FFmpegExtractAudio ➜ FFmpegMetadata ➜ EmbedThumbnail (3 lancements de ffmpeg
+    et 2 réécritures du fichier par piste).
+    """
+
+    # tag ID3 → champs yt-dlp, par ordre de préférence
+    TAGS = {
+        "title": ("track", "title"),
+        "artist": ("artist", "creator", "uploader"),
+        "album": ("album",),
+        "track": ("track_number",),
+        "date": ("release_date", "upload_date"),
+    }
+
+    def __init__(self, downloader=None, quality: str = "192"):
+        super().__init__(downloader)
+        self.quality = quality
+
+    def run(self, info):
+        src = info["filepath"]
+        base = os.path.splitext(src)[0]
+        thumbs = [
+            t["filepath"] for t in info.get("thumbnails") or () if t.get("filepath")
+        ]
+        thumb = thumbs[-1] if thumbs else None  # miniature écrite par writethumbnail
+
+        inputs, opts = [src], ["-map", "0:a"]
+        if thumb:
+            inputs.append(thumb)
+            opts += ["-map", "1:v", "-c:v", "mjpeg", "-disposition:v", "attached_pic"]
+        if info.get("acodec") == "mp3" or info.get("ext") == "mp3":
+            opts += ["-c:a", "copy"]  # déjà en MP3 : copie sans réencodage
+        else:
+            opts += ["-c:a", "libmp3lame", "-b:a", f"{self.quality}k"]
+        opts += ["-id3v2_version", "3"]
+        for tag, fields in self.TAGS.items():
+            val = next((info[f] for f in fields if info.get(f)), None)
+            if val:
+                opts += ["-metadata", f"{tag}={val}"]
+
+        # fichier temporaire : la source peut déjà s'appeler .mp3
+        tmp = f"{base}.temp.mp3"
+        self.to_screen(f'Conversion MP3 : "{base}.mp3"')
+        self.run_ffmpeg_multiple_files(inputs, tmp, opts)
+        os.replace(tmp, f"{base}.mp3")
+
+        info["filepath"], info["ext"] = f"{base}.mp3", "mp3"
+        # yt-dlp supprime ces fichiers (sauf option keepvideo)
+        garbage = [f for f in (src, thumb) if f and f != info["filepath"]]
+        return garbage, info
+
+
 def build_ydl_opts(fmt: str, outtmpl: str, embed_thumb: bool) -> dict:
     opts = {
         "outtmpl": outtmpl,
@@ -247,19 +482,12 @@ def build_ydl_opts(fmt: str, outtmpl: str, embed_thumb: bool) -> dict:
         "progress_hooks": [],
         "ignoreerrors": True,
         "socket_timeout": 10,
+        "allowed_extractors": YT_EXTRACTORS,
     }
     if fmt == "mp3":
+        # conversion, tags et miniature : Mp3OnePassPP (voir download_list)
         opts["format"] = "bestaudio/best"
-        opts["postprocessors"] = [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            },
-            {"key": "FFmpegMetadata"},  # ⇦ ajoute tags ID3
-        ]
         if embed_thumb:
-            opts["postprocessors"].append({"key": "EmbedThumbnail"})
             opts["writethumbnail"] = True
     else:
         opts["format"] = "bestvideo+bestaudio/best"
@@ -277,28 +505,70 @@ def download_list(
     is_playlist: bool,
     verbose: bool,
     embed_thumb: bool,
+    concurrency: int = 3,
 ):
     os.makedirs(outdir, exist_ok=True)
     tot = len(urls)
-    bar = tqdm(total=tot, desc="Total", unit="vidéo")
+    total_slot = acquire_slot()
+    bar = tqdm(
+        total=tot,
+        desc="Total",
+        unit="vidéo",
+        position=total_slot,
+        disable=_bars_off,
+    )
     fails = []
-    for i, url in enumerate(urls, 1):
-        pb = ProgressBar()
-        name_tmpl = (
-            "%(title)s.%(ext)s" if not is_playlist else f"{i:03d} - %(title)s.%(ext)s"
-        )
-        opts = build_ydl_opts(fmt, os.path.join(outdir, name_tmpl), embed_thumb)
-        opts["progress_hooks"] = [pb.hook]
-
+    # un YoutubeDL (et sa barre) par thread, réutilisé pour toutes ses vidéos :
+    # initialisation et connexions payées une seule fois
+    tls = threading.local()
+    opened = []
+    bars = []  # ProgressBar des threads, dont la ligne est rendue à la fin
+    # modèles de nom préparés une fois ; seul le numéro est inséré par vidéo
+    sep = "" if outdir.endswith(os.sep) else os.sep
+    solo_tmpl = f"{outdir}{sep}%(title)s.%(ext)s"
+    # accolades du dossier doublées : seul {:03d} est interprété par format()
+    pl_dir = outdir.replace("{", "{{").replace("}", "}}")
+    pl_tmpl = f"{pl_dir}{sep}{{:03d}} - %(title)s.%(ext)s"
+
+    def _do_one(i: int, url: str):
+        outtmpl = pl_tmpl.format(i) if is_playlist else solo_tmpl
+        ydl = getattr(tls, "ydl", None)
+        if ydl is None:
+            tls.pb = ProgressBar(position=acquire_slot())
+            bars.append(tls.pb)
+            opts = build_ydl_opts(fmt, outtmpl, embed_thumb)
+            opts["progress_hooks"] = [tls.pb.hook]
+            ydl = tls.ydl = YoutubeDL(opts)
+            if fmt == "mp3":
+                ydl.add_post_processor(Mp3OnePassPP(ydl), when="post_process")
+            opened.append(ydl)
+        tls.pb.reset()
+        # seul le modèle de nom change d'une vidéo à l'autre ; les autres types
+        # (chapter, thumbnail…) remplis par yt-dlp sont conservés
+        ydl.params["outtmpl"]["default"] = outtmpl
         try:
-            with YoutubeDL(opts) as ydl:
-                ydl.download([url])
+            ydl.download([url])
         except DownloadError as e:
-            fails.append((url, str(e)))
-            if verbose:
-                print(f"[Erreur] {url} -> {e}")
-        bar.update(1)
+            return url, str(e)
+        return url, None
+
+    # téléchargements limités par le réseau : quelques-uns en parallèle
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        futures = [ex.submit(_do_one, i, url) for i, url in enumerate(urls, 1)]
+        for fut in as_completed(futures):
+            url, err = fut.result()
+            if err is not None:
+                fails.append((url, err))
+                if verbose:
+                    print(f"[Erreur] {url} -> {err}")
+            bar.update(1)  # fil principal uniquement : pas de verrou
     bar.close()
+    for ydl in opened:
+        ydl.close()
+    for pb in bars:
+        pb.reset()
+        release_slot(pb.position)
+    release_slot(total_slot)
     if fails:
         print(f"⚠️  {len(fails)} vidéo(s) en erreur :")
         for u, err in fails:
@@ -314,6 +584,9 @@ Options :
   --format mp3|mp4     Format de sortie (défaut mp4)
   --output DIR         Choisir le répertoire de sortie
   --thumbnail          Intégrer la miniature (si possible)
+  --concurrency N      Téléchargements simultanés (défaut 3)
+  --jobs N             Entrées traitées en parallèle (défaut 2)
+  --procs N            Entrées réparties sur N processus (remplace --jobs)
   --verbose            Afficher détails (scores, urls…)
   --help               Cette aide
 """
@@ -324,16 +597,87 @@ def gather_tasks(args) -> List[Tuple[str, str]]:
     for inp in args.inputs:
         if os.path.isfile(inp):
             with open(inp, encoding="utf-8") as f:
-                for l in f:
-                    l = l.strip()
-                    if not l:
-                        continue
-                    tasks.append(("search" if not l.startswith("http") else "url", l))
+                lines = f.read().splitlines()
+            for l in lines:
+                l = l.strip()
+                if not l:
+                    continue
+                tasks.append(("search" if not l.startswith(_HTTP) else "url", l))
         else:
-            tasks.append(("search" if not inp.startswith("http") else "url", inp))
+            tasks.append(("search" if not inp.startswith(_HTTP) else "url", inp))
     if args.search:
         tasks.append(("search", args.search))
-    return tasks
+    # même URL ou même recherche en double : traitée une seule fois (ordre conservé)
+    return list(dict.fromkeys(tasks))
+
+
+async def process_task(kind: str, val: str, args):
+    try:
+        url = val
+        if kind == "search":
+            url = await search_best(val, verbose=args.verbose)
+
+        # yt-dlp reste bloquant : exécuté dans un thread
+        urls, is_pl, title = await asyncio.to_thread(get_video_list, url)
+        outdir = args.output or (sanitize(title) if is_pl else "downloads")
+        if args.verbose:
+            print(f"⬇️  Téléchargement vers '{outdir}' ({len(urls)} fichier(s))")
+        await asyncio.to_thread(
+            download_list,
+            urls,
+            args.format,
+            outdir,
+            is_pl,
+            verbose=args.verbose,
+            embed_thumb=args.thumbnail,
+            concurrency=args.concurrency,
+        )
+    except Exception as exc:
+        print(f"[Erreur] {val}\n        ↳ {exc}")
+
+
+async def handle_task(kind: str, val: str, args, sem: asyncio.Semaphore):
+    async with sem:
+        await process_task(kind, val, args)
+
+
+async def run_tasks(tasks: List[Tuple[str, str]], args):
+    # tâches traitées en parallèle, au plus --jobs à la fois
+    sem = asyncio.Semaphore(max(1, args.jobs))
+    await asyncio.gather(*(handle_task(kind, val, args, sem) for kind, val in tasks))
+
+
+def _init_worker():
+    global _bars_off
+    _bars_off = True
+    load_list_cache()
+
+
+def _handle_task(job: Tuple[str, str, argparse.Namespace]) -> dict:
+    # point d'entrée d'un processus de --procs (fonction de module : picklable)
+    with _list_lock:
+        before = dict(_list_cache)
+    asyncio.run(process_task(*job))
+    # atexit ne tourne pas dans les workers : les listes extraites sont
+    # renvoyées au parent, qui les enregistre avec les siennes
+    with _list_lock:
+        return {u: v for u, v in _list_cache.items() if before.get(u) is not v}
+
+
+def run_tasks_procs(tasks: List[Tuple[str, str]], args):
+    # une tâche par processus : interpréteur, connexions et yt-dlp propres à
+    # chacun ; les téléchargements parallèles (--concurrency) restent des threads
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(min(len(tasks), args.procs), initializer=_init_worker) as pool:
+        jobs = [(kind, val, args) for kind, val in tasks]
+        for fresh in tqdm(
+            pool.imap_unordered(_handle_task, jobs),
+            total=len(jobs),
+            desc="Tâches",
+            unit="tâche",
+        ):
+            with _list_lock:
+                _list_cache.update(fresh)
 
 
 def cli():
@@ -344,6 +688,9 @@ def cli():
     p.add_argument("--output")
     p.add_argument("--thumbnail", action="store_true")
     p.add_argument("--verbose", action="store_true")
+    p.add_argument("--concurrency", type=int, default=3)
+    p.add_argument("--jobs", type=int, default=2)
+    p.add_argument("--procs", type=int, default=0)
     p.add_argument("--help", action="store_true")
     args = p.parse_args()
 
@@ -356,26 +703,12 @@ def cli():
         print("Aucune tâche.")
         sys.exit(1)
 
-    for kind, val in tasks:
-        try:
-            url = val
-            if kind == "search":
-                url = search_best(val, verbose=args.verbose)
-
-            urls, is_pl, title = get_video_list(url)
-            outdir = args.output or (sanitize(title) if is_pl else "downloads")
-            if args.verbose:
-                print(f"⬇️  Téléchargement vers '{outdir}' ({len(urls)} fichier(s))")
-            download_list(
-                urls,
-                args.format,
-                outdir,
-                is_pl,
-                verbose=args.verbose,
-                embed_thumb=args.thumbnail,
-            )
-        except Exception as exc:
-            print(f"[Erreur] {val}\n        ↳ {exc}")
+    load_list_cache()
+    atexit.register(save_list_cache)
+    if args.procs > 0:
+        run_tasks_procs(tasks, args)
+    else:
+        asyncio.run(run_tasks(tasks, args))
 
 
 if __name__ == "__main__":